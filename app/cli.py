@@ -0,0 +1,19 @@
+# app/cli.py
+"""
+Management commands
+Usage: python -m app.cli init-db
+"""
+import argparse
+from app.core.database import create_tables
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("init-db", help="Create database tables and apply pending migrations")
+    
+    args = parser.parse_args()
+    if args.command == "init-db":
+        create_tables()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from .config import settings
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry expiry
+    Evicts the least recently used entry once maxsize is reached
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for ttl seconds"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+# Authenticated users, keyed by user ID. Writes through UserService and
+# TeamService invalidate entries in this process; the TTL bounds how long
+# other worker processes can serve a stale user.
+user_cache = TTLCache(maxsize=10_000, ttl=settings.user_cache_ttl_seconds)
+
+# Serialized active-member lists, keyed by team ID
+members_cache = TTLCache(maxsize=1024, ttl=60)
+
+# Expensive COUNT(*) results, keyed by a short name
+count_cache = TTLCache(maxsize=256, ttl=60)
+
+# Per-alert, per-user and per-team analytics, keyed by (kind, id). Reads,
+# snoozes and reminders invalidate the alert and user entries in this process;
+# otherwise, and in other worker processes, entries simply expire.
+analytics_cache = TTLCache(maxsize=4096, ttl=30)
@@ -5,7 +5,23 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-here"
     app_name: str = "Alerting & Notification Platform"
     debug: bool = True
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 10
+    db_pool_recycle: int = 1800
+    db_query_cache_size: int = 1200
+    # Report relationship lazy loads: "allow", "warn" or "raise" (development)
+    db_lazy_loads: str = "allow"
+    db_warm_pool: bool = True
+    # Create and migrate tables at startup; only the development .env enables it
+    auto_create_tables: bool = False
+    user_cache_ttl_seconds: int = 5
+    # Per-process alert feed caches; bounds how stale other workers' feeds can be
+    alert_feed_cache_ttl_seconds: int = 30
+    analytics_snapshot_max_age_seconds: int = 300
     reminder_interval_hours: int = 2
+    reminder_check_interval_seconds: int = 300
+    pending_delivery_interval_seconds: int = 10
     
     class Config:
         env_file = ".env"
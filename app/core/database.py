@@ -1,15 +1,70 @@
 # app/core/database.py
-from sqlalchemy import create_engine
+import warnings
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from .config import settings
 
+# Bulk INSERTs already go out as multi-row VALUES on every dialect. psycopg2
+# would still send executemany UPDATEs and DELETEs one row per round trip,
+# so have it batch those too.
+_driver_options = {}
+if make_url(settings.database_url).get_dialect().driver == "psycopg2":
+    _driver_options["executemany_mode"] = "values_plus_batch"
+
+# Keep a fixed pool of connections so requests reuse them instead of
+# reopening the database file (and its WAL/SHM files) every time. Handlers
+# run in FastAPI's threadpool, so the pool is sized for that concurrency.
+# Connections are pre-pinged and recycled periodically so a server-side
+# idle timeout never hands a dead connection to a request.
+_is_sqlite = settings.database_url.startswith("sqlite")
+
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    poolclass=QueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    # Compiled SQL is cached per statement structure; the default 500 entries
+    # churn once feed, count and admin filter variants are all in use
+    query_cache_size=settings.db_query_cache_size,
+    **_driver_options
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        """Tune each new SQLite connection: WAL journal, relaxed fsync, larger cache"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if settings.db_lazy_loads in ("warn", "raise"):
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _report_lazy_load(orm_execute_state):
+        """
+        Flag relationship lazy loads in development, the usual source of N+1
+        queries; eager loads (joinedload, selectinload) are not reported
+        """
+        if not orm_execute_state.is_select or orm_execute_state.lazy_loaded_from is None:
+            return
+        relationship = orm_execute_state.loader_strategy_path[-1]
+        message = f"Lazy load of {relationship} emitted SQL; load it eagerly instead"
+        if settings.db_lazy_loads == "raise":
+            raise exc.InvalidRequestError(message)
+        warnings.warn(message, stacklevel=2)
 Base = declarative_base()
 
 def get_db():
@@ -19,10 +74,44 @@ def get_db():
     finally:
         db.close()
 
+@contextmanager
+def session_scope():
+    """
+    Session for work outside a request, such as scheduler jobs
+    Rolls back on error and always returns the connection to the pool
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def warm_pool(size: int = settings.db_pool_size):
+    """
+    Open `size` pooled connections up front so the first requests after
+    startup don't pay for connecting and per-connection PRAGMA setup
+    """
+    connections = []
+    try:
+        # Hold every connection until all are open, otherwise the pool
+        # would hand back the same one each time
+        for _ in range(size):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+
 def create_tables():
+    """Create the tables on a new database, or migrate an existing one"""
     # Import models to register them with Base
-    from app.models import User, Team, Alert, NotificationDelivery, UserAlertPreference
+    from app.models import User, Team, Alert, NotificationDelivery, UserAlertPreference, AnalyticsSnapshot
+    from app.migrations import migrate
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    for version in migrate(engine):
+        print(f"Applied migration {version}")
     print("Database tables created successfully!")
\ No newline at end of file
@@ -0,0 +1,44 @@
+# app/core/pagination.py
+import base64
+import orjson
+from datetime import datetime
+from typing import Any, Tuple
+
+# Response header carrying the cursor for the next page of a keyset listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Response header carrying the total row count when a listing is asked for it
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    # orjson writes datetimes as ISO 8601, which decode_timestamp_cursor parses
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode()
+
+def decode_cursor(cursor: str) -> Tuple[Any, ...]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
+
+def decode_timestamp_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a (created_at, id) cursor"""
+    values = decode_cursor(cursor)
+    try:
+        created_at, row_id = values
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def decode_id_cursor(cursor: str) -> int:
+    """Decode an (id,) cursor"""
+    values = decode_cursor(cursor)
+    try:
+        (row_id,) = values
+        return int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
@@ -1,18 +1,33 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import create_tables, warm_pool
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 from app.router import (
     users_router, teams_router, alerts_router, 
     notifications_router, analytics_router
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and migrate tables at startup when enabled; production runs `python -m app.cli init-db` instead"""
+    if settings.auto_create_tables:
+        await asyncio.to_thread(create_tables)
+    if settings.db_warm_pool:
+        await asyncio.to_thread(warm_pool)
+    yield
+
 app = FastAPI(
     title=settings.app_name,
     description="A lightweight alerting and notification system with clean OOP design",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -22,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
 # Include routers
@@ -31,12 +47,6 @@ app.include_router(alerts_router, prefix="/api/v1")
 app.include_router(notifications_router, prefix="/api/v1")
 app.include_router(analytics_router, prefix="/api/v1")
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on startup"""
-    create_tables()
-    print("Database tables created successfully")
-
 @app.get("/")
 async def root():
     return {
@@ -0,0 +1,64 @@
+# app/migrations/__init__.py
+"""
+Versioned schema migrations
+create_all only adds missing tables, so every change to a table that
+already exists (column types, dropped columns, rewritten data, new
+indexes) is a module here with an upgrade(connection) function. Migrations run in order, each
+in its own transaction, and are recorded in schema_migrations.
+"""
+from datetime import datetime
+from typing import List
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, insert, select
+from sqlalchemy.engine import Engine
+from app.core.database import Base
+from . import v0001_enum_values, v0002_alert_targets, v0003_add_indexes
+
+MIGRATIONS = (
+    v0001_enum_values,
+    v0002_alert_targets,
+    v0003_add_indexes,
+)
+
+# Kept out of Base.metadata, so its absence marks a database that predates
+# migrations
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+def _version(module) -> str:
+    return module.__name__.rsplit(".", 1)[-1]
+
+def migrate(engine: Engine) -> List[str]:
+    """
+    Create missing tables, then apply pending migrations and return their
+    versions. A new database already has the current schema, so its
+    migrations are only recorded
+    """
+    is_new = not inspect(engine).has_table("alerts")
+    _metadata.create_all(bind=engine)
+    # Also runs the trigger DDL registered on Base.metadata
+    Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as connection:
+        applied = set(connection.scalars(select(schema_migrations.c.version)))
+        if is_new:
+            now = datetime.utcnow()
+            for module in MIGRATIONS:
+                connection.execute(insert(schema_migrations), {"version": _version(module), "applied_at": now})
+            return []
+    
+    applied_now = []
+    for module in MIGRATIONS:
+        version = _version(module)
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(insert(schema_migrations), {"version": version, "applied_at": datetime.utcnow()})
+        applied_now.append(version)
+    return applied_now
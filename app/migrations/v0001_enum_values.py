@@ -0,0 +1,41 @@
+# app/migrations/v0001_enum_values.py
+"""
+Store enum columns as their values ('active') instead of the member names
+('ACTIVE') the earlier Enum columns wrote, so EnumStr filters match them.
+On PostgreSQL the native enum types behind those columns become VARCHAR.
+"""
+from sqlalchemy import case, column, table, text, update
+from sqlalchemy.engine import Connection
+from app.models.alert import SeverityLevel, DeliveryType, VisibilityType, AlertStatus
+from app.models.notification_delivery import DeliveryStatus, DeliveryChannel
+
+# (table, column, enum, PostgreSQL type created by the earlier Enum column)
+_COLUMNS = (
+    ("alerts", "severity", SeverityLevel, "severitylevel"),
+    ("alerts", "delivery_type", DeliveryType, "deliverytype"),
+    ("alerts", "visibility_type", VisibilityType, "visibilitytype"),
+    ("alerts", "status", AlertStatus, "alertstatus"),
+    ("notification_deliveries", "channel", DeliveryChannel, "deliverychannel"),
+    ("notification_deliveries", "status", DeliveryStatus, "deliverystatus"),
+)
+
+def upgrade(connection: Connection) -> None:
+    is_postgresql = connection.dialect.name == "postgresql"
+    for table_name, column_name, enum_cls, pg_type in _COLUMNS:
+        if is_postgresql:
+            connection.execute(text(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                f"TYPE VARCHAR(16) USING {column_name}::text"
+            ))
+        
+        names = {member.name: member.value for member in enum_cls}
+        target = column(column_name)
+        connection.execute(
+            update(table(table_name, target))
+            .where(target.in_(list(names)))
+            .values({column_name: case(names, value=target)})
+        )
+    
+    if is_postgresql:
+        for pg_type in {pg_type for *_, pg_type in _COLUMNS}:
+            connection.execute(text(f"DROP TYPE IF EXISTS {pg_type}"))
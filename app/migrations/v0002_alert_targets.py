@@ -0,0 +1,48 @@
+# app/migrations/v0002_alert_targets.py
+"""
+Copy the JSON target_team_ids/target_user_ids columns of alerts into the
+alert_target_teams and alert_target_users tables, then drop the columns
+"""
+import orjson
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from typing import List, Optional
+from app.models.alert import alert_target_teams, alert_target_users
+
+def _decode_ids(value: Optional[str]) -> List[int]:
+    """Decode a stored JSON array of IDs; NULL and '' mean no targets"""
+    if not value:
+        return []
+    return [int(target_id) for target_id in orjson.loads(value)]
+
+def upgrade(connection: Connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("alerts")}
+    if "target_team_ids" not in columns:
+        return
+    
+    rows = connection.execute(text(
+        "SELECT id, target_team_ids, target_user_ids FROM alerts "
+        "WHERE target_team_ids IS NOT NULL OR target_user_ids IS NOT NULL"
+    )).all()
+    # IDs of deleted teams or users have no row to reference, so they are dropped
+    team_ids = set(connection.scalars(text("SELECT id FROM teams")))
+    user_ids = set(connection.scalars(text("SELECT id FROM users")))
+    team_rows = [
+        {"alert_id": alert_id, "team_id": team_id}
+        for alert_id, targets, _ in rows for team_id in set(_decode_ids(targets)) if team_id in team_ids
+    ]
+    user_rows = [
+        {"alert_id": alert_id, "user_id": user_id}
+        for alert_id, _, targets in rows for user_id in set(_decode_ids(targets)) if user_id in user_ids
+    ]
+    
+    # Rows already copied by an earlier, interrupted run are skipped
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    if team_rows:
+        connection.execute(dialect.insert(alert_target_teams).on_conflict_do_nothing(), team_rows)
+    if user_rows:
+        connection.execute(dialect.insert(alert_target_users).on_conflict_do_nothing(), user_rows)
+    
+    connection.execute(text("ALTER TABLE alerts DROP COLUMN target_team_ids"))
+    connection.execute(text("ALTER TABLE alerts DROP COLUMN target_user_ids"))
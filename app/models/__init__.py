@@ -1,14 +1,18 @@
 # app/models/__init__.py
 from .user import User
-from .team import Team
-from .alert import Alert
+from .team import Team, TeamMemberCount
+from .alert import Alert, AlertEngagementCount
 from .notification_delivery import NotificationDelivery
 from .user_alert_preference import UserAlertPreference
+from .analytics_snapshot import AnalyticsSnapshot
 
 __all__ = [
     "User",
     "Team", 
+    "TeamMemberCount",
     "Alert",
+    "AlertEngagementCount",
     "NotificationDelivery",
-    "UserAlertPreference"
+    "UserAlertPreference",
+    "AnalyticsSnapshot"
 ]
\ No newline at end of file
@@ -1,8 +1,11 @@
 # app/models/alert.py
-from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Table, DDL, event, and_, or_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from .types import EnumStr
+from datetime import datetime
 import enum
 
 class SeverityLevel(enum.Enum):
@@ -25,16 +28,53 @@ class AlertStatus(enum.Enum):
     EXPIRED = "expired"
     ARCHIVED = "archived"
 
+# Visibility targeting association tables
+alert_target_teams = Table(
+    "alert_target_teams",
+    Base.metadata,
+    Column("alert_id", Integer, ForeignKey("alerts.id", ondelete="CASCADE"), primary_key=True),
+    Column("team_id", Integer, ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_alert_target_teams_team", "team_id", "alert_id"),
+)
+
+alert_target_users = Table(
+    "alert_target_users",
+    Base.metadata,
+    Column("alert_id", Integer, ForeignKey("alerts.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_alert_target_users_user", "user_id", "alert_id"),
+)
+
+class AlertEngagementCount(Base):
+    """
+    Recipient, read and snooze counters per alert, kept current by triggers
+    on user_alert_preferences so engagement stats and top-N rankings never
+    have to aggregate the preferences table
+    """
+    __tablename__ = "alert_engagement_counts"
+    
+    alert_id = Column(Integer, ForeignKey("alerts.id", ondelete="CASCADE"), primary_key=True)
+    recipient_count = Column(Integer, nullable=False, default=0)
+    read_count = Column(Integer, nullable=False, default=0)
+    snoozed_count = Column(Integer, nullable=False, default=0)  # preferences currently flagged is_snoozed
+    snooze_count = Column(Integer, nullable=False, default=0)  # sum of snooze_count, every snooze ever
+    
+    # Indexes for the most read and most snoozed rankings
+    __table_args__ = (
+        Index('ix_aec_read_count', 'read_count', 'alert_id'),
+        Index('ix_aec_snooze_count', 'snooze_count', 'alert_id'),
+    )
+
 class Alert(Base):
     __tablename__ = "alerts"
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=False)
-    severity = Column(Enum(SeverityLevel), nullable=False, default=SeverityLevel.INFO)
-    delivery_type = Column(Enum(DeliveryType), nullable=False, default=DeliveryType.IN_APP)
-    visibility_type = Column(Enum(VisibilityType), nullable=False, default=VisibilityType.ORGANIZATION)
-    status = Column(Enum(AlertStatus), nullable=False, default=AlertStatus.ACTIVE)
+    severity = Column(EnumStr(SeverityLevel), nullable=False, default=SeverityLevel.INFO)
+    delivery_type = Column(EnumStr(DeliveryType), nullable=False, default=DeliveryType.IN_APP)
+    visibility_type = Column(EnumStr(VisibilityType), nullable=False, default=VisibilityType.ORGANIZATION)
+    status = Column(EnumStr(AlertStatus), nullable=False, default=AlertStatus.ACTIVE)
     
     # Timing
     start_time = Column(DateTime(timezone=True), nullable=False, default=func.now())
@@ -42,10 +82,6 @@ class Alert(Base):
     reminder_interval_hours = Column(Integer, default=2)
     reminders_enabled = Column(Boolean, default=True)
     
-    # Visibility targeting
-    target_team_ids = Column(Text, nullable=True)  # JSON array of team IDs
-    target_user_ids = Column(Text, nullable=True)  # JSON array of user IDs
-    
     # Audit fields
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -56,13 +92,38 @@ class Alert(Base):
     notifications = relationship("NotificationDelivery", back_populates="alert", cascade="all, delete-orphan")
     user_preferences = relationship("UserAlertPreference", back_populates="alert", cascade="all, delete-orphan")
     
+    # Visibility targeting
+    target_teams = relationship("Team", secondary=alert_target_teams)
+    target_users = relationship("User", secondary=alert_target_users)
+    
+    # Indexes for the admin filters, active-window checks and the newest-first
+    # user feed, which only ever reads active alerts
+    __table_args__ = (
+        Index('ix_alerts_status_severity', 'status', 'severity'),
+        Index('ix_alerts_start_expiry', 'start_time', 'expiry_time'),
+        Index(
+            'ix_alerts_active_created', 'created_at', 'id',
+            sqlite_where=(status == AlertStatus.ACTIVE),
+            postgresql_where=(status == AlertStatus.ACTIVE)
+        ),
+    )
+    
     def __repr__(self):
         return f"<Alert(id={self.id}, title='{self.title}', severity='{self.severity}')>"
     
     @property
+    def target_team_ids(self):
+        """IDs of the teams this alert targets"""
+        return [team.id for team in self.target_teams]
+    
+    @property
+    def target_user_ids(self):
+        """IDs of the users this alert targets"""
+        return [user.id for user in self.target_users]
+    
+    @hybrid_property
     def is_active(self):
         """Check if alert is currently active"""
-        from datetime import datetime
         now = datetime.utcnow()
         
         if self.status != AlertStatus.ACTIVE:
@@ -74,4 +135,121 @@ class Alert(Base):
         if self.expiry_time and now > self.expiry_time:
             return False
             
-        return True
\ No newline at end of file
+        return True
+    
+    @is_active.expression
+    def is_active(cls):
+        """SQL form of is_active, usable in filters"""
+        now = datetime.utcnow()
+        return and_(
+            cls.status == AlertStatus.ACTIVE,
+            cls.start_time <= now,
+            or_(cls.expiry_time.is_(None), cls.expiry_time > now)
+        )
+
+# Triggers keeping alert_engagement_counts in step with every write to
+# user_alert_preferences, including the bulk INSERT ... SELECT and UPDATE
+# statements that bypass the ORM
+_ENGAGEMENT_COUNT_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_uap_engagement_insert
+    AFTER INSERT ON user_alert_preferences
+    BEGIN
+        INSERT INTO alert_engagement_counts (alert_id, recipient_count, read_count, snoozed_count, snooze_count)
+        VALUES (NEW.alert_id, 1, COALESCE(NEW.is_read, 0), COALESCE(NEW.is_snoozed, 0), COALESCE(NEW.snooze_count, 0))
+        ON CONFLICT (alert_id) DO UPDATE SET
+            recipient_count = recipient_count + 1,
+            read_count = read_count + excluded.read_count,
+            snoozed_count = snoozed_count + excluded.snoozed_count,
+            snooze_count = snooze_count + excluded.snooze_count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_uap_engagement_delete
+    AFTER DELETE ON user_alert_preferences
+    BEGIN
+        UPDATE alert_engagement_counts SET
+            recipient_count = recipient_count - 1,
+            read_count = read_count - COALESCE(OLD.is_read, 0),
+            snoozed_count = snoozed_count - COALESCE(OLD.is_snoozed, 0),
+            snooze_count = snooze_count - COALESCE(OLD.snooze_count, 0)
+        WHERE alert_id = OLD.alert_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_uap_engagement_update
+    AFTER UPDATE OF alert_id, is_read, is_snoozed, snooze_count ON user_alert_preferences
+    BEGIN
+        UPDATE alert_engagement_counts SET
+            recipient_count = recipient_count - 1,
+            read_count = read_count - COALESCE(OLD.is_read, 0),
+            snoozed_count = snoozed_count - COALESCE(OLD.is_snoozed, 0),
+            snooze_count = snooze_count - COALESCE(OLD.snooze_count, 0)
+        WHERE alert_id = OLD.alert_id;
+        INSERT INTO alert_engagement_counts (alert_id, recipient_count, read_count, snoozed_count, snooze_count)
+        VALUES (NEW.alert_id, 1, COALESCE(NEW.is_read, 0), COALESCE(NEW.is_snoozed, 0), COALESCE(NEW.snooze_count, 0))
+        ON CONFLICT (alert_id) DO UPDATE SET
+            recipient_count = recipient_count + 1,
+            read_count = read_count + excluded.read_count,
+            snoozed_count = snoozed_count + excluded.snoozed_count,
+            snooze_count = snooze_count + excluded.snooze_count;
+    END
+    """,
+    # Backfill alerts that had preferences before the triggers existed
+    """
+    INSERT OR IGNORE INTO alert_engagement_counts (alert_id, recipient_count, read_count, snoozed_count, snooze_count)
+    SELECT alert_id, COUNT(*), SUM(COALESCE(is_read, 0)), SUM(COALESCE(is_snoozed, 0)), SUM(COALESCE(snooze_count, 0))
+    FROM user_alert_preferences
+    GROUP BY alert_id
+    """,
+)
+
+for _statement in _ENGAGEMENT_COUNT_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+# The same counters on PostgreSQL, where a trigger runs a PL/pgSQL function
+_ENGAGEMENT_COUNT_PG_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION uap_engagement_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            UPDATE alert_engagement_counts SET
+                recipient_count = recipient_count - 1,
+                read_count = read_count - COALESCE(OLD.is_read, false)::int,
+                snoozed_count = snoozed_count - COALESCE(OLD.is_snoozed, false)::int,
+                snooze_count = snooze_count - COALESCE(OLD.snooze_count, 0)
+            WHERE alert_id = OLD.alert_id;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO alert_engagement_counts (alert_id, recipient_count, read_count, snoozed_count, snooze_count)
+            VALUES (NEW.alert_id, 1, COALESCE(NEW.is_read, false)::int,
+                    COALESCE(NEW.is_snoozed, false)::int, COALESCE(NEW.snooze_count, 0))
+            ON CONFLICT (alert_id) DO UPDATE SET
+                recipient_count = alert_engagement_counts.recipient_count + 1,
+                read_count = alert_engagement_counts.read_count + excluded.read_count,
+                snoozed_count = alert_engagement_counts.snoozed_count + excluded.snoozed_count,
+                snooze_count = alert_engagement_counts.snooze_count + excluded.snooze_count;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_uap_engagement ON user_alert_preferences",
+    """
+    CREATE TRIGGER trg_uap_engagement
+    AFTER INSERT OR DELETE OR UPDATE OF alert_id, is_read, is_snoozed, snooze_count ON user_alert_preferences
+    FOR EACH ROW EXECUTE FUNCTION uap_engagement_count()
+    """,
+    # Backfill alerts that had preferences before the trigger existed
+    """
+    INSERT INTO alert_engagement_counts (alert_id, recipient_count, read_count, snoozed_count, snooze_count)
+    SELECT alert_id, COUNT(*), SUM(COALESCE(is_read, false)::int), SUM(COALESCE(is_snoozed, false)::int),
+           SUM(COALESCE(snooze_count, 0))
+    FROM user_alert_preferences
+    GROUP BY alert_id
+    ON CONFLICT (alert_id) DO NOTHING
+    """,
+)
+
+for _statement in _ENGAGEMENT_COUNT_PG_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
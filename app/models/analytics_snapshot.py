@@ -0,0 +1,17 @@
+# app/models/analytics_snapshot.py
+from sqlalchemy import Column, Integer, Text, DateTime
+from app.core.database import Base
+
+class AnalyticsSnapshot(Base):
+    """
+    Precomputed analytics dashboard, stored as the serialized AnalyticsResponse
+    so the dashboard endpoint is a single row read
+    """
+    __tablename__ = "analytics_snapshots"
+    
+    id = Column(Integer, primary_key=True)
+    generated_at = Column(DateTime(timezone=True), nullable=False)
+    payload = Column(Text, nullable=False)
+    
+    def __repr__(self):
+        return f"<AnalyticsSnapshot(id={self.id}, generated_at={self.generated_at})>"
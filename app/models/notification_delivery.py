@@ -1,8 +1,9 @@
 # app/models/notification_delivery.py
-from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from .types import EnumStr
 import enum
 
 class DeliveryStatus(enum.Enum):
@@ -25,8 +26,8 @@ class NotificationDelivery(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Delivery details
-    channel = Column(Enum(DeliveryChannel), nullable=False, default=DeliveryChannel.IN_APP)
-    status = Column(Enum(DeliveryStatus), nullable=False, default=DeliveryStatus.PENDING)
+    channel = Column(EnumStr(DeliveryChannel), nullable=False, default=DeliveryChannel.IN_APP)
+    status = Column(EnumStr(DeliveryStatus), nullable=False, default=DeliveryStatus.PENDING)
     delivery_address = Column(String(255), nullable=True)  # email address or phone number
     
     # Timing
@@ -54,5 +55,23 @@ class NotificationDelivery(Base):
     alert = relationship("Alert", back_populates="notifications")
     user = relationship("User", back_populates="received_notifications")
     
+    # Indexes for per-user history, per-alert delivery analytics, the
+    # pending-delivery send and the failed-delivery retry sweep
+    __table_args__ = (
+        Index('ix_nd_user_status', 'user_id', 'status'),
+        Index('ix_nd_user_created', 'user_id', 'created_at', 'id'),
+        Index('ix_nd_alert_status_reminder', 'alert_id', 'status', 'is_reminder'),
+        Index(
+            'ix_nd_pending_channel', 'channel',
+            sqlite_where=(status == DeliveryStatus.PENDING),
+            postgresql_where=(status == DeliveryStatus.PENDING)
+        ),
+        Index(
+            'ix_nd_next_retry', 'next_retry_at',
+            sqlite_where=(status == DeliveryStatus.FAILED),
+            postgresql_where=(status == DeliveryStatus.FAILED)
+        ),
+    )
+    
     def __repr__(self):
         return f"<NotificationDelivery(id={self.id}, alert_id={self.alert_id}, user_id={self.user_id}, status='{self.status}')>"
\ No newline at end of file
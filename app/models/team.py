@@ -1,9 +1,19 @@
 # app/models/team.py
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, DDL, event, select
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+class TeamMemberCount(Base):
+    """
+    Active member count per team, kept current by triggers on users
+    so listing teams never has to aggregate the users table
+    """
+    __tablename__ = "team_member_counts"
+    
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    member_count = Column(Integer, nullable=False, default=0)
+
 class Team(Base):
     __tablename__ = "teams"
     
@@ -14,8 +24,144 @@ class Team(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Denormalized active member count, a primary key lookup per team
+    member_count = column_property(
+        func.coalesce(
+            select(TeamMemberCount.member_count)
+            .where(TeamMemberCount.team_id == id)
+            .correlate_except(TeamMemberCount)
+            .scalar_subquery(),
+            0
+        )
+    )
+    
     # Relationships
     members = relationship("User", back_populates="team")
     
     def __repr__(self):
-        return f"<Team(id={self.id}, name='{self.name}')>"
\ No newline at end of file
+        return f"<Team(id={self.id}, name='{self.name}')>"
+
+# Triggers keeping team_member_counts in step with every write to users,
+# including bulk UPDATEs that bypass the ORM. An active user with a team_id
+# counts as one member of that team.
+_MEMBER_COUNT_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_users_member_count_insert
+    AFTER INSERT ON users
+    WHEN NEW.team_id IS NOT NULL AND NEW.is_active
+    BEGIN
+        INSERT INTO team_member_counts (team_id, member_count) VALUES (NEW.team_id, 1)
+        ON CONFLICT (team_id) DO UPDATE SET member_count = member_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_users_member_count_delete
+    AFTER DELETE ON users
+    WHEN OLD.team_id IS NOT NULL AND OLD.is_active
+    BEGIN
+        UPDATE team_member_counts SET member_count = member_count - 1 WHERE team_id = OLD.team_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_users_member_count_update
+    AFTER UPDATE OF team_id, is_active ON users
+    BEGIN
+        UPDATE team_member_counts SET member_count = member_count - 1
+        WHERE team_id = OLD.team_id AND OLD.is_active;
+        INSERT INTO team_member_counts (team_id, member_count)
+        SELECT NEW.team_id, 1 WHERE NEW.team_id IS NOT NULL AND NEW.is_active
+        ON CONFLICT (team_id) DO UPDATE SET member_count = member_count + 1;
+    END
+    """,
+    # Backfill teams that had members before the triggers existed
+    """
+    INSERT OR IGNORE INTO team_member_counts (team_id, member_count)
+    SELECT team_id, COUNT(*) FROM users
+    WHERE team_id IS NOT NULL AND is_active
+    GROUP BY team_id
+    """,
+)
+
+for _statement in _MEMBER_COUNT_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+# The same counts on PostgreSQL, where a trigger runs a PL/pgSQL function
+_MEMBER_COUNT_PG_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION users_member_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF OLD.team_id IS NOT NULL AND OLD.is_active THEN
+                UPDATE team_member_counts SET member_count = member_count - 1
+                WHERE team_id = OLD.team_id;
+            END IF;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            IF NEW.team_id IS NOT NULL AND NEW.is_active THEN
+                INSERT INTO team_member_counts (team_id, member_count) VALUES (NEW.team_id, 1)
+                ON CONFLICT (team_id) DO UPDATE SET member_count = team_member_counts.member_count + 1;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_users_member_count ON users",
+    """
+    CREATE TRIGGER trg_users_member_count
+    AFTER INSERT OR DELETE OR UPDATE OF team_id, is_active ON users
+    FOR EACH ROW EXECUTE FUNCTION users_member_count()
+    """,
+    # Backfill teams that had members before the trigger existed
+    """
+    INSERT INTO team_member_counts (team_id, member_count)
+    SELECT team_id, COUNT(*) FROM users
+    WHERE team_id IS NOT NULL AND is_active
+    GROUP BY team_id
+    ON CONFLICT (team_id) DO NOTHING
+    """,
+)
+
+for _statement in _MEMBER_COUNT_PG_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
+# Trigram full-text index over team names and descriptions, so substring
+# search uses an index instead of scanning teams. It is an external-content
+# FTS5 table: it stores only the index and is kept in step by triggers.
+_TEAM_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS team_search USING fts5(
+        name, description, content='teams', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_teams_search_insert
+    AFTER INSERT ON teams
+    BEGIN
+        INSERT INTO team_search (rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_teams_search_delete
+    AFTER DELETE ON teams
+    BEGIN
+        INSERT INTO team_search (team_search, rowid, name, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_teams_search_update
+    AFTER UPDATE OF name, description ON teams
+    BEGIN
+        INSERT INTO team_search (team_search, rowid, name, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.description);
+        INSERT INTO team_search (rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description);
+    END
+    """,
+    # Index teams that existed before the search table
+    "INSERT INTO team_search (team_search) VALUES ('rebuild')",
+)
+
+for _statement in _TEAM_SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,31 @@
+# app/models/types.py
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+class EnumStr(TypeDecorator):
+    """
+    Stores a Python enum as its plain string value
+    Cheaper than SQLAlchemy's Enum type: binding and loading are a single
+    attribute read or dict lookup
+    """
+    impl = String(16)
+    cache_ok = True
+    
+    def __init__(self, enum_cls):
+        self.enum_cls = enum_cls
+        # Also read member names, which the previous Enum columns stored, in
+        # rows the v0001_enum_values migration hasn't rewritten yet
+        self._members = {member.name: member for member in enum_cls}
+        self._members.update({member.value: member for member in enum_cls})
+        super().__init__()
+    
+    def process_bind_param(self, value, dialect):
+        """Accept model enums, the schemas' str enums, or raw values"""
+        if value is None:
+            return None
+        return getattr(value, 'value', value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
@@ -1,5 +1,5 @@
 # app/models/user.py
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -17,10 +17,21 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    team = relationship("Team", back_populates="members")
+    # User listings serialize team_id only; loading the Team lazily per row
+    # would be an N+1, so fail loudly and make callers use selectinload()
+    team = relationship("Team", back_populates="members", lazy="raise_on_sql")
     alert_preferences = relationship("UserAlertPreference", back_populates="user", cascade="all, delete-orphan")
     received_notifications = relationship("NotificationDelivery", back_populates="user", cascade="all, delete-orphan")
     created_alerts = relationship("Alert", back_populates="creator", foreign_keys="Alert.created_by")
     
+    # Partial index for active-member lookups and counts per team
+    __table_args__ = (
+        Index(
+            'ix_users_team_active', 'team_id',
+            sqlite_where=(is_active == True),
+            postgresql_where=(is_active == True)
+        ),
+    )
+    
     def __repr__(self):
         return f"<User(id={self.id}, name='{self.name}', email='{self.email}')>"
\ No newline at end of file
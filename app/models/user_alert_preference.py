@@ -1,9 +1,20 @@
 # app/models/user_alert_preference.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+import time
+
+def _utc_ts(value: datetime) -> float:
+    """
+    Convert a datetime from the database to a POSIX timestamp
+    SQLite hands back naive UTC values; PostgreSQL timestamptz values are
+    aware and may be in the session's time zone
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc).timestamp()
+    return value.astimezone(timezone.utc).timestamp()
 
 class UserAlertPreference(Base):
     __tablename__ = "user_alert_preferences"
@@ -33,9 +44,19 @@ class UserAlertPreference(Base):
     user = relationship("User", back_populates="alert_preferences")
     alert = relationship("Alert", back_populates="user_preferences")
     
-    # Ensure one preference record per user per alert
+    # Ensure one preference record per user per alert (which also indexes
+    # (user_id, alert_id)), and index the per-user read/snooze lookups, the
+    # unread feed's anti-join and the per-alert reminder sweep
     __table_args__ = (
         UniqueConstraint('user_id', 'alert_id', name='_user_alert_preference_uc'),
+        Index('ix_uap_user_read_snoozed', 'user_id', 'is_read', 'is_snoozed'),
+        Index(
+            'ix_uap_user_alert_read', 'user_id', 'alert_id',
+            sqlite_where=(is_read == True),
+            postgresql_where=(is_read == True)
+        ),
+        Index('ix_uap_reminder', 'last_reminded_at'),
+        Index('ix_uap_alert_read', 'alert_id', 'is_read', 'is_snoozed', 'last_reminded_at'),
     )
     
     def __repr__(self):
@@ -44,31 +65,26 @@ class UserAlertPreference(Base):
     @property
     def should_receive_reminder(self):
         """Check if user should receive reminder for this alert"""
-        from datetime import datetime, timedelta
-        
+        # Get reminder interval from alert (default 2 hours)
+        interval_hours = getattr(self.alert, 'reminder_interval_hours', 2)
+        return self.needs_reminder(time.time(), interval_hours * 3600)
+    
+    def needs_reminder(self, now_ts: float, interval_s: int) -> bool:
+        """
+        Check reminder eligibility against a sweep-wide UTC timestamp
+        An expired snooze doesn't block a reminder; the caller clears it
+        """
         # If snoozed, check if snooze period has expired
-        if self.is_snoozed:
-            now = datetime.utcnow()
-            if self.snoozed_until and now < self.snoozed_until:
-                return False
-            else:
-                # Snooze period expired, reset snooze
-                self.is_snoozed = False
-                self.snoozed_until = None
+        if self.is_snoozed and self.snoozed_until and now_ts < _utc_ts(self.snoozed_until):
+            return False
         
         # If already read, don't send reminders
         if self.is_read:
             return False
         
         # Check if enough time has passed since last reminder
-        if self.last_reminded_at:
-            time_since_last = datetime.utcnow() - self.last_reminded_at
-            # Get reminder interval from alert (default 2 hours)
-            interval_hours = getattr(self.alert, 'reminder_interval_hours', 2)
-            if time_since_last.total_seconds() < (interval_hours * 3600):
-                return False
-        
-        return True
+        last_ts = _utc_ts(self.last_reminded_at) if self.last_reminded_at else 0.0
+        return now_ts - last_ts >= interval_s
     
     def mark_as_read(self):
         """Mark alert as read for this user"""
@@ -1,37 +1,75 @@
 # app/routers/alerts.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from app.core.pagination import TOTAL_COUNT_HEADER, NEXT_CURSOR_HEADER, encode_cursor, decode_timestamp_cursor
 from typing import List, Optional
+from app.schemas import ALERT_ADAPTER, ALERT_LIST_ADAPTER
 from app.schemas.alert import (
     AlertCreate, AlertUpdate, AlertResponse, AlertListResponse,
-    SeverityLevel, AlertStatus, MarkReadRequest, SnoozeAlertRequest
+    SeverityLevel, AlertStatus, MarkReadRequest, MarkAlertsReadRequest, SnoozeAlertRequest
 )
 from app.services.alert_service import AlertService
-from app.models.user import User
-from .dependencies import get_current_user, get_current_admin_user, get_alert_service
+from .dependencies import CurrentUser, get_current_user, get_current_admin_user, get_alert_service
+from .responses import json_response
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
+_EMPTY_STATS = {'total_recipients': 0, 'read_count': 0, 'snoozed_count': 0}
+_ALERT_FIELDS = (
+    'id', 'title', 'message', 'severity', 'delivery_type', 'visibility_type',
+    'status', 'start_time', 'expiry_time', 'reminder_interval_hours',
+    'reminders_enabled', 'created_by', 'created_at', 'updated_at'
+)
+_ENUM_FIELDS = ('severity', 'delivery_type', 'visibility_type', 'status')
+
+def _alert_response(alert, stats: dict = _EMPTY_STATS) -> AlertResponse:
+    """Build an AlertResponse from a trusted Alert row without validation"""
+    fields = {name: getattr(alert, name) for name in _ALERT_FIELDS}
+    fields.update(stats)
+    fields['is_active'] = alert.is_active
+    fields['target_team_ids'] = alert.target_team_ids or None
+    fields['target_user_ids'] = alert.target_user_ids or None
+    # The schema declares its own str enums, so pass the plain values
+    for name in _ENUM_FIELDS:
+        fields[name] = fields[name].value
+    return AlertResponse.model_construct(**fields)
+
+def _user_alerts_response(alert_service: AlertService, user_id: int, include_read: bool,
+                          skip: int, limit: int, cursor: Optional[str]):
+    """Fetch one page of a user's alerts with the next-page cursor header"""
+    try:
+        after = decode_timestamp_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    payload, next_after = alert_service.get_alerts_for_user_json(
+        user_id=user_id,
+        include_read=include_read,
+        skip=skip,
+        limit=limit,
+        after=after
+    )
+    response = json_response(payload)
+    if next_after is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*next_after)
+    return response
+
 # Admin endpoints
+# These keep response_model for the OpenAPI schema but return pre-serialized
+# JSON directly, so FastAPI does not re-validate rows from the database.
 @router.post("/", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
-async def create_alert(
+def create_alert(
     alert_data: AlertCreate,
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Create a new alert (Admin only)"""
     try:
         alert = alert_service.create_alert(alert_data, current_user.id)
         
-        # Convert to response format
-        alert_dict = alert.__dict__.copy()
-        alert_dict['is_active'] = alert.is_active
-        alert_dict['target_team_ids'] = eval(alert.target_team_ids) if alert.target_team_ids else None
-        alert_dict['target_user_ids'] = eval(alert.target_user_ids) if alert.target_user_ids else None
-        alert_dict['total_recipients'] = 0  # Will be calculated by service
-        alert_dict['read_count'] = 0
-        alert_dict['snoozed_count'] = 0
-        
-        return alert_dict
+        return json_response(ALERT_ADAPTER.dump_json(_alert_response(alert)), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,13 +77,14 @@ async def create_alert(
         )
 
 @router.get("/admin", response_model=List[AlertResponse])
-async def list_all_alerts_admin(
+def list_all_alerts_admin(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     severity: Optional[SeverityLevel] = Query(None),
     status: Optional[AlertStatus] = Query(None),
+    include_total: bool = Query(False, description="Return the filtered total in X-Total-Count"),
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """List all alerts with admin filters"""
     alerts = alert_service.get_alerts_by_filters(
@@ -56,51 +95,42 @@ async def list_all_alerts_admin(
         limit=limit
     )
     
-    # Convert to response format
-    response_alerts = []
-    for alert in alerts:
-        alert_dict = alert.__dict__.copy()
-        alert_dict['is_active'] = alert.is_active
-        alert_dict['target_team_ids'] = eval(alert.target_team_ids) if alert.target_team_ids else None
-        alert_dict['target_user_ids'] = eval(alert.target_user_ids) if alert.target_user_ids else None
-        alert_dict['total_recipients'] = 0  # TODO: Calculate from service
-        alert_dict['read_count'] = 0
-        alert_dict['snoozed_count'] = 0
-        response_alerts.append(alert_dict)
+    # Recipient stats for the whole page come from one grouped query
+    # rather than walking each alert's user_preferences relationship
+    stats = alert_service.get_recipient_stats([alert.id for alert in alerts])
+    
+    response_alerts = [_alert_response(alert, stats.get(alert.id, _EMPTY_STATS)) for alert in alerts]
+    response = json_response(ALERT_LIST_ADAPTER.dump_json(response_alerts))
     
-    return response_alerts
+    # The COUNT(*) is a second query, so it only runs when asked for
+    if include_total:
+        total = alert_service.count_alerts_by_filters(severity=severity, status=status)
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return response
 
 @router.get("/admin/{alert_id}", response_model=AlertResponse)
-async def get_alert_admin(
+def get_alert_admin(
     alert_id: int,
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Get alert by ID (Admin only)"""
-    alert = alert_service.get_by_id(alert_id)
+    alert = alert_service.get_alert_with_targets(alert_id)
     if not alert:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found"
         )
     
-    # Convert to response format
-    alert_dict = alert.__dict__.copy()
-    alert_dict['is_active'] = alert.is_active
-    alert_dict['target_team_ids'] = eval(alert.target_team_ids) if alert.target_team_ids else None
-    alert_dict['target_user_ids'] = eval(alert.target_user_ids) if alert.target_user_ids else None
-    alert_dict['total_recipients'] = 0
-    alert_dict['read_count'] = 0
-    alert_dict['snoozed_count'] = 0
-    
-    return alert_dict
+    stats = alert_service.get_recipient_stats([alert.id])
+    return json_response(ALERT_ADAPTER.dump_json(_alert_response(alert, stats.get(alert.id, _EMPTY_STATS))))
 
 @router.put("/{alert_id}", response_model=AlertResponse)
-async def update_alert(
+def update_alert(
     alert_id: int,
     alert_data: AlertUpdate,
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Update alert (Admin only)"""
     try:
@@ -111,16 +141,7 @@ async def update_alert(
                 detail="Alert not found"
             )
         
-        # Convert to response format
-        alert_dict = updated_alert.__dict__.copy()
-        alert_dict['is_active'] = updated_alert.is_active
-        alert_dict['target_team_ids'] = eval(updated_alert.target_team_ids) if updated_alert.target_team_ids else None
-        alert_dict['target_user_ids'] = eval(updated_alert.target_user_ids) if updated_alert.target_user_ids else None
-        alert_dict['total_recipients'] = 0
-        alert_dict['read_count'] = 0
-        alert_dict['snoozed_count'] = 0
-        
-        return alert_dict
+        return json_response(ALERT_ADAPTER.dump_json(_alert_response(updated_alert)))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -128,10 +149,10 @@ async def update_alert(
         )
 
 @router.delete("/{alert_id}")
-async def archive_alert(
+def archive_alert(
     alert_id: int,
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Archive alert (Admin only)"""
     success = alert_service.archive_alert(alert_id)
@@ -144,27 +165,22 @@ async def archive_alert(
 
 # User endpoints
 @router.get("/", response_model=List[dict])
-async def get_user_alerts(
+def get_user_alerts(
     include_read: bool = Query(True),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get alerts visible to current user"""
-    alerts = alert_service.get_alerts_for_user(
-        user_id=current_user.id,
-        include_read=include_read,
-        skip=skip,
-        limit=limit
-    )
-    return alerts
+    return _user_alerts_response(alert_service, current_user.id, include_read, skip, limit, cursor)
 
 @router.post("/mark-read")
-async def mark_alert_as_read(
+def mark_alert_as_read(
     request: MarkReadRequest,
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Mark an alert as read for current user"""
     success = alert_service.mark_alert_as_read(request.alert_id, current_user.id)
@@ -175,11 +191,21 @@ async def mark_alert_as_read(
         )
     return {"message": "Alert marked as read"}
 
+@router.post("/mark-read/batch")
+def mark_alerts_as_read(
+    request: MarkAlertsReadRequest,
+    alert_service: AlertService = Depends(get_alert_service),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Mark several alerts as read for current user in one commit; unknown IDs are ignored"""
+    updated = alert_service.mark_alerts_as_read(request.alert_ids, current_user.id)
+    return {"message": "Alerts marked as read", "updated": updated}
+
 @router.post("/snooze")
-async def snooze_alert(
+def snooze_alert(
     request: SnoozeAlertRequest,
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Snooze an alert for current user until end of day"""
     success = alert_service.snooze_alert_for_user(request.alert_id, current_user.id)
@@ -191,35 +217,20 @@ async def snooze_alert(
     return {"message": "Alert snoozed until end of day"}
 
 @router.get("/unread")
-async def get_unread_alerts(
-    skip: int = Query(0, ge=0),
+def get_unread_alerts(
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get only unread alerts for current user"""
-    alerts = alert_service.get_alerts_for_user(
-        user_id=current_user.id,
-        include_read=False,
-        skip=skip,
-        limit=limit
-    )
-    return alerts
+    return _user_alerts_response(alert_service, current_user.id, False, skip, limit, cursor)
 
 @router.get("/count")
-async def get_alert_counts(
+def get_alert_counts(
     alert_service: AlertService = Depends(get_alert_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get alert counts for current user"""
-    all_alerts = alert_service.get_alerts_for_user(current_user.id, include_read=True)
-    unread_alerts = alert_service.get_alerts_for_user(current_user.id, include_read=False)
-    
-    snoozed_count = sum(1 for alert in all_alerts if alert.get('is_snoozed', False))
-    
-    return {
-        "total_alerts": len(all_alerts),
-        "unread_alerts": len(unread_alerts),
-        "read_alerts": len(all_alerts) - len(unread_alerts),
-        "snoozed_alerts": snoozed_count
-    }
\ No newline at end of file
+    return alert_service.get_alert_counts(current_user.id)
\ No newline at end of file
@@ -1,25 +1,33 @@
 from fastapi import APIRouter, Depends, Query
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.analytics_service import AnalyticsService
 from app.schemas.analytics import AnalyticsResponse
-from app.models.user import User
-from .dependencies import get_current_user, get_current_admin_user, get_analytics_service
+from .dependencies import CurrentUser, get_current_user, get_current_admin_user, get_analytics_service
+from .responses import json_response
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Upper bound on alert IDs accepted by the bulk metrics endpoint
+MAX_BULK_ALERT_IDS = 500
+
 @router.get("/dashboard", response_model=AnalyticsResponse)
-async def get_analytics_dashboard(
+def get_analytics_dashboard(
+    max_age_seconds: Optional[int] = Query(
+        None, ge=0,
+        description="Oldest snapshot to accept; older ones are recomputed (0 forces a live report)"
+    ),
     analytics_service: AnalyticsService = Depends(get_analytics_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Get comprehensive analytics dashboard (Admin only)"""
-    return analytics_service.generate_analytics_report()
+    # Served from the precomputed snapshot; generated_at shows its age
+    return json_response(analytics_service.get_dashboard_json(max_age_seconds).encode())
 
 @router.get("/alert/{alert_id}")
-async def get_alert_performance(
+def get_alert_performance(
     alert_id: int,
     analytics_service: AnalyticsService = Depends(get_analytics_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ) -> Dict[str, Any]:
     """Get performance metrics for a specific alert (Admin only)"""
     metrics = analytics_service.get_alert_performance_metrics(alert_id)
@@ -31,11 +39,26 @@ async def get_alert_performance(
         )
     return metrics
 
+@router.get("/alerts")
+def get_alerts_performance(
+    alert_ids: List[int] = Query([], description="Repeat for each alert, e.g. ?alert_ids=1&alert_ids=2"),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    current_user: CurrentUser = Depends(get_current_admin_user)
+) -> List[Dict[str, Any]]:
+    """Get performance metrics for up to 500 alerts at once; unknown IDs are left out (Admin only)"""
+    if len(alert_ids) > MAX_BULK_ALERT_IDS:
+        from fastapi import HTTPException, status
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_ALERT_IDS} alert IDs per request"
+        )
+    return analytics_service.get_alert_performance_metrics_bulk(alert_ids)
+
 @router.get("/user/{user_id}")
-async def get_user_engagement(
+def get_user_engagement(
     user_id: int,
     analytics_service: AnalyticsService = Depends(get_analytics_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ) -> Dict[str, Any]:
     """Get engagement metrics for a specific user (Admin only)"""
     metrics = analytics_service.get_user_engagement_metrics(user_id)
@@ -48,10 +71,10 @@ async def get_user_engagement(
     return metrics
 
 @router.get("/team/{team_id}")
-async def get_team_analytics(
+def get_team_analytics(
     team_id: int,
     analytics_service: AnalyticsService = Depends(get_analytics_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ) -> Dict[str, Any]:
     """Get analytics for a specific team (Admin only)"""
     metrics = analytics_service.get_team_analytics(team_id)
@@ -64,9 +87,9 @@ async def get_team_analytics(
     return metrics
 
 @router.get("/me")
-async def get_my_engagement(
+def get_my_engagement(
     analytics_service: AnalyticsService = Depends(get_analytics_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """Get engagement metrics for current user"""
     return analytics_service.get_user_engagement_metrics(current_user.id)
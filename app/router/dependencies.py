@@ -1,20 +1,48 @@
 # app/routers/dependencies.py
+from dataclasses import dataclass, fields
+from datetime import datetime
 from fastapi import Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.core.database import get_db
+from app.core.cache import user_cache
 from app.services.user_service import UserService
+from app.services.team_service import TeamService
+from app.services.alert_service import AlertService
+from app.services.notification_service import NotificationService
+from app.services.analytics_service import AnalyticsService
 from app.models.user import User
 
-# Simple authentication dependency (MVP - just user ID in header)
-async def get_current_user(
-    x_user_id: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-) -> User:
+# Handlers and dependencies that touch the database are plain `def`: the
+# session is synchronous, so FastAPI runs them in its threadpool rather
+# than blocking the event loop for every query.
+#
+# get_db is resolved once per request and shared by authentication and
+# every service dependency, so a request holds at most one session and
+# one pooled connection; nothing here opens a session of its own.
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
     """
-    Simple authentication for MVP
-    In production, this would validate JWT tokens
+    Immutable snapshot of the authenticated user's columns
+    Cached in user_cache and shared between request threads, so it holds no
+    session or relationships; handlers that need the ORM User load it by id
     """
+    id: int
+    name: str
+    email: str
+    is_admin: bool
+    team_id: Optional[int]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+    
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(**{field.name: getattr(user, field.name) for field in fields(cls)})
+
+def _authenticate(x_user_id: Optional[str], db: Session) -> CurrentUser:
+    """Resolve the X-User-Id header to an active user or raise 401"""
     if not x_user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,8 +57,14 @@ async def get_current_user(
             detail="Invalid user ID format"
         )
     
-    user_service = UserService(db)
-    user = user_service.get_by_id(user_id)
+    # Serve repeat requests from a short-lived cache of user snapshots
+    user = user_cache.get(user_id)
+    if user is None:
+        user_service = UserService(db)
+        user = user_service.get_by_id(user_id)
+        if user:
+            user = CurrentUser.from_user(user)
+            user_cache.set(user_id, user)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -40,11 +74,28 @@ async def get_current_user(
     
     return user
 
+# Simple authentication dependency (MVP - just user ID in header)
+# FastAPI caches dependency results per request, so a handler whose
+# services also depend on get_db shares one session with authentication
+def get_current_user(
+    x_user_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+) -> CurrentUser:
+    """
+    Simple authentication for MVP
+    In production, this would validate JWT tokens
+    """
+    return _authenticate(x_user_id, db)
+
 # Admin user dependency
-async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+# Resolves the user itself instead of depending on get_current_user, so
+# admin routes run a single dependency
+def get_current_admin_user(
+    x_user_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+) -> CurrentUser:
     """Require admin privileges"""
+    current_user = _authenticate(x_user_id, db)
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -55,25 +106,20 @@ async def get_current_admin_user(
 # Service dependencies
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
     """Get UserService instance"""
-    from app.services.user_service import UserService
     return UserService(db)
 
-def get_team_service(db: Session = Depends(get_db)):
+def get_team_service(db: Session = Depends(get_db)) -> TeamService:
     """Get TeamService instance"""
-    from app.services.team_service import TeamService
     return TeamService(db)
 
-def get_alert_service(db: Session = Depends(get_db)):
+def get_alert_service(db: Session = Depends(get_db)) -> AlertService:
     """Get AlertService instance"""
-    from app.services.alert_service import AlertService
     return AlertService(db)
 
-def get_notification_service(db: Session = Depends(get_db)):
+def get_notification_service(db: Session = Depends(get_db)) -> NotificationService:
     """Get NotificationService instance"""
-    from app.services.notification_service import NotificationService
     return NotificationService(db)
 
-def get_analytics_service(db: Session = Depends(get_db)):
+def get_analytics_service(db: Session = Depends(get_db)) -> AnalyticsService:
     """Get AnalyticsService instance"""
-    from app.services.analytics_service import AnalyticsService
     return AnalyticsService(db)
\ No newline at end of file
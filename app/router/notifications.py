@@ -1,33 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Dict, Optional
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_timestamp_cursor
+from app.schemas.notification import MarkNotificationsReadRequest
 from app.services.notification_service import NotificationService
-from app.models.user import User
-from .dependencies import get_current_user, get_current_admin_user, get_notification_service
+from .dependencies import CurrentUser, get_current_user, get_current_admin_user, get_notification_service
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
+def _list_notifications(notification_service: NotificationService, response: Response,
+                        user_id: int, include_read: bool, skip: int, limit: int,
+                        cursor: Optional[str]) -> List[Dict]:
+    """Fetch one page of notifications and set the next-page cursor header"""
+    try:
+        after = decode_timestamp_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    notifications = notification_service.get_user_notifications(
+        user_id=user_id,
+        include_read=include_read,
+        skip=skip,
+        limit=limit,
+        after=after
+    )
+    if len(notifications) == limit:
+        last = notifications[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last['created_at'], last['id'])
+    return notifications
+
 @router.get("/", response_model=List[Dict])
-async def get_user_notifications(
+def get_user_notifications(
+    response: Response,
     include_read: bool = Query(True, description="Include read notifications"),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
     limit: int = Query(50, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     notification_service: NotificationService = Depends(get_notification_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get notifications for current user"""
-    notifications = notification_service.get_user_notifications(
-        user_id=current_user.id,
-        include_read=include_read,
-        skip=skip,
-        limit=limit
+    return _list_notifications(
+        notification_service, response, current_user.id, include_read, skip, limit, cursor
     )
-    return notifications
+
+@router.post("/read")
+def mark_notifications_as_read(
+    request: MarkNotificationsReadRequest,
+    notification_service: NotificationService = Depends(get_notification_service),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Mark several notifications as read; IDs not belonging to the user are ignored"""
+    updated = notification_service.mark_notifications_as_read(request.notification_ids, current_user.id)
+    return {"message": "Notifications marked as read", "updated": updated}
 
 @router.post("/{notification_id}/read")
-async def mark_notification_as_read(
+def mark_notification_as_read(
     notification_id: int,
     notification_service: NotificationService = Depends(get_notification_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Mark a specific notification as read"""
     success = notification_service.mark_notification_as_read(notification_id, current_user.id)
@@ -39,17 +72,15 @@ async def mark_notification_as_read(
     return {"message": "Notification marked as read"}
 
 @router.get("/unread", response_model=List[Dict])
-async def get_unread_notifications(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+def get_unread_notifications(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
     limit: int = Query(50, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     notification_service: NotificationService = Depends(get_notification_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get only unread notifications for current user"""
-    notifications = notification_service.get_user_notifications(
-        user_id=current_user.id,
-        include_read=False,
-        skip=skip,
-        limit=limit
-    )
-    return notifications
\ No newline at end of file
+    return _list_notifications(
+        notification_service, response, current_user.id, False, skip, limit, cursor
+    )
\ No newline at end of file
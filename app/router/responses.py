@@ -0,0 +1,7 @@
+# app/routers/responses.py
+from fastapi import status
+from fastapi.responses import Response
+
+def json_response(content: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+    """Wrap pre-serialized JSON bytes in a response"""
+    return Response(content=content, status_code=status_code, media_type="application/json")
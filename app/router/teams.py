@@ -1,26 +1,33 @@
 # app/routers/teams.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_id_cursor
+from app.schemas import TEAM_LIST_ADAPTER, USER_LIST_ADAPTER
+from app.schemas.user import UserResponse
 from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse
 from app.services.team_service import TeamService
-from app.models.user import User
-from .dependencies import get_current_user, get_current_admin_user, get_team_service
+from .dependencies import CurrentUser, get_current_user, get_current_admin_user, get_team_service
+from .responses import json_response
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
+_TEAM_FIELDS = ('id', 'name', 'description', 'is_active', 'created_at', 'updated_at')
+
+def _team_response(team, member_count: int = 0) -> TeamResponse:
+    """Build a TeamResponse from a trusted Team row without validation"""
+    fields = {name: getattr(team, name) for name in _TEAM_FIELDS}
+    return TeamResponse.model_construct(**fields, member_count=member_count)
+
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
-async def create_team(
+def create_team(
     team_data: TeamCreate,
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Create a new team (Admin only)"""
     try:
         team = team_service.create_team(team_data)
-        # Add member_count for response
-        team_dict = team.__dict__.copy()
-        team_dict['member_count'] = 0
-        return team_dict
+        return _team_response(team)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -28,40 +35,34 @@ async def create_team(
         )
 
 @router.get("/", response_model=List[TeamResponse])
-async def list_teams(
+def list_teams(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     include_member_count: bool = Query(True),
     search: Optional[str] = Query(None),
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """List all teams"""
     if search:
-        teams_data = team_service.search_teams(search, limit)
-        # Convert to dict format with member counts
-        teams = []
-        for team in teams_data:
-            team_dict = team.__dict__.copy()
-            if include_member_count:
-                team_dict['member_count'] = team_service.get_team_member_count(team.id)
-            else:
-                team_dict['member_count'] = 0
-            teams.append(team_dict)
-        return teams
-    
-    if include_member_count:
-        teams = team_service.get_teams_with_member_count(skip=skip, limit=limit)
-        return teams
+        teams_data = team_service.search_teams(search, limit, skip=skip)
     else:
-        teams = team_service.get_active_teams(skip=skip, limit=limit)
-        return [dict(team.__dict__, member_count=0) for team in teams]
+        teams_data = team_service.get_active_teams(skip=skip, limit=limit)
+    
+    # member_count comes back with each row from SQL, no per-team queries
+    teams = [
+        _team_response(team, team.member_count if include_member_count else 0)
+        for team in teams_data
+    ]
+    
+    # The page is serialized in one pass; response_model stays for the schema
+    return json_response(TEAM_LIST_ADAPTER.dump_json(teams))
 
 @router.get("/{team_id}", response_model=TeamResponse)
-async def get_team(
+def get_team(
     team_id: int,
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get team by ID"""
     team = team_service.get_by_id(team_id)
@@ -71,19 +72,14 @@ async def get_team(
             detail="Team not found"
         )
     
-    # Add member count
-    member_count = team_service.get_team_member_count(team_id)
-    team_dict = team.__dict__.copy()
-    team_dict['member_count'] = member_count
-    
-    return team_dict
+    return _team_response(team, team.member_count)
 
 @router.put("/{team_id}", response_model=TeamResponse)
-async def update_team(
+def update_team(
     team_id: int,
     team_data: TeamUpdate,
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Update team (Admin only)"""
     try:
@@ -94,12 +90,7 @@ async def update_team(
                 detail="Team not found"
             )
         
-        # Add member count
-        member_count = team_service.get_team_member_count(team_id)
-        team_dict = updated_team.__dict__.copy()
-        team_dict['member_count'] = member_count
-        
-        return team_dict
+        return _team_response(updated_team, updated_team.member_count)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -107,10 +98,10 @@ async def update_team(
         )
 
 @router.delete("/{team_id}")
-async def deactivate_team(
+def deactivate_team(
     team_id: int,
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Deactivate team and remove all members (Admin only)"""
     success = team_service.deactivate_team(team_id)
@@ -122,11 +113,11 @@ async def deactivate_team(
     return {"message": "Team deactivated successfully"}
 
 @router.post("/{team_id}/members/{user_id}")
-async def add_member_to_team(
+def add_member_to_team(
     team_id: int,
     user_id: int,
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Add a user to a team (Admin only)"""
     success = team_service.add_member_to_team(user_id, team_id)
@@ -138,10 +129,10 @@ async def add_member_to_team(
     return {"message": "Member added to team successfully"}
 
 @router.delete("/members/{user_id}")
-async def remove_member_from_team(
+def remove_member_from_team(
     user_id: int,
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Remove a user from their current team (Admin only)"""
     success = team_service.remove_member_from_team(user_id)
@@ -152,11 +143,13 @@ async def remove_member_from_team(
         )
     return {"message": "Member removed from team successfully"}
 
-@router.get("/{team_id}/members")
-async def get_team_members_list(
+@router.get("/{team_id}/members", response_model=List[UserResponse])
+def get_team_members_list(
     team_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to return every member"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     team_service: TeamService = Depends(get_team_service),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get all members of a specific team"""
     # Users can view their own team or admins can view any team
@@ -166,5 +159,22 @@ async def get_team_members_list(
             detail="Can only view your own team members"
         )
     
-    members = team_service.get_team_members(team_id)
-    return members
\ No newline at end of file
+    # The full list is shared with /users/team/{team_id}/members and cached
+    if limit is None and cursor is None:
+        return json_response(team_service.get_team_members_json(team_id))
+    
+    try:
+        after_id = decode_id_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    members = team_service.get_team_members(team_id, after_id=after_id, limit=limit)
+    response = json_response(USER_LIST_ADAPTER.dump_json(
+        USER_LIST_ADAPTER.validate_python(members, from_attributes=True)
+    ))
+    if limit is not None and len(members) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(members[-1].id)
+    return response
\ No newline at end of file
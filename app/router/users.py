@@ -1,18 +1,27 @@
 # app/routers/users.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
+from app.schemas import USER_LIST_ADAPTER
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserLogin
 from app.services.user_service import UserService
+from app.services.team_service import TeamService
 from app.models.user import User
-from .dependencies import get_current_user, get_current_admin_user, get_user_service
+from .dependencies import CurrentUser, get_current_user, get_current_admin_user, get_user_service, get_team_service
+from .responses import json_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+def _user_list_response(users: List[User]):
+    """Validate and serialize a page of users in one adapter pass"""
+    return json_response(USER_LIST_ADAPTER.dump_json(
+        USER_LIST_ADAPTER.validate_python(users, from_attributes=True)
+    ))
+
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     user_data: UserCreate,
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Create a new user (Admin only)"""
     try:
@@ -25,16 +34,16 @@ async def create_user(
         )
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+def get_current_user_info(
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get current user information"""
     return current_user
 
 @router.put("/me", response_model=UserResponse)
-async def update_current_user(
+def update_current_user(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service)
 ):
     """Update current user information"""
@@ -58,13 +67,13 @@ async def update_current_user(
         )
 
 @router.get("/", response_model=List[UserResponse])
-async def list_users(
+def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     team_id: Optional[int] = Query(None),
     active_only: bool = Query(True),
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """List users (Admin only)"""
     if team_id:
@@ -74,13 +83,13 @@ async def list_users(
     else:
         users = user_service.get_all(skip=skip, limit=limit)
     
-    return users
+    return _user_list_response(users)
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Get user by ID (Admin only)"""
     user = user_service.get_by_id(user_id)
@@ -92,11 +101,11 @@ async def get_user(
     return user
 
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Update user by ID (Admin only)"""
     try:
@@ -114,10 +123,10 @@ async def update_user(
         )
 
 @router.delete("/{user_id}")
-async def deactivate_user(
+def deactivate_user(
     user_id: int,
     user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: CurrentUser = Depends(get_current_admin_user)
 ):
     """Deactivate user (Admin only)"""
     success = user_service.deactivate_user(user_id)
@@ -129,7 +138,7 @@ async def deactivate_user(
     return {"message": "User deactivated successfully"}
 
 @router.post("/login", response_model=UserResponse)
-async def login(
+def login(
     login_data: UserLogin,
     user_service: UserService = Depends(get_user_service)
 ):
@@ -143,10 +152,10 @@ async def login(
     return user
 
 @router.get("/team/{team_id}/members", response_model=List[UserResponse])
-async def get_team_members(
+def get_team_members(
     team_id: int,
-    user_service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user)
+    team_service: TeamService = Depends(get_team_service),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get all members of a team"""
     # Users can view their own team or admins can view any team
@@ -156,5 +165,5 @@ async def get_team_members(
             detail="Can only view your own team members"
         )
     
-    members = user_service.get_users_by_team(team_id)
-    return members
\ No newline at end of file
+    # Same cached list as GET /teams/{team_id}/members
+    return json_response(team_service.get_team_members_json(team_id))
\ No newline at end of file
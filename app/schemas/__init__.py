@@ -1,4 +1,6 @@
 # app/schemas/__init__.py
+from typing import List
+from pydantic import TypeAdapter
 from .user import UserCreate, UserUpdate, UserResponse, UserLogin
 from .team import TeamCreate, TeamUpdate, TeamResponse
 from .alert import (
@@ -8,6 +10,13 @@ from .alert import (
 from .notification import NotificationResponse
 from .analytics import AnalyticsResponse
 
+# Serializers for hot responses, built once at import time. A list adapter
+# walks the whole page in one compiled validator/serializer call.
+ALERT_ADAPTER = TypeAdapter(AlertResponse)
+ALERT_LIST_ADAPTER = TypeAdapter(List[AlertResponse])
+TEAM_LIST_ADAPTER = TypeAdapter(List[TeamResponse])
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+
 __all__ = [
     # User schemas
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin",
@@ -19,5 +28,7 @@ __all__ = [
     # Notification schemas
     "NotificationResponse",
     # Analytics schemas
-    "AnalyticsResponse"
+    "AnalyticsResponse",
+    # Response adapters
+    "ALERT_ADAPTER", "ALERT_LIST_ADAPTER", "TEAM_LIST_ADAPTER", "USER_LIST_ADAPTER"
 ]
\ No newline at end of file
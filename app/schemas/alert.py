@@ -1,5 +1,5 @@
 # app/schemas/alert.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -72,15 +72,15 @@ class AlertResponse(AlertBase):
     read_count: Optional[int] = 0
     snoozed_count: Optional[int] = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AlertListResponse(BaseModel):
     alerts: List[AlertResponse]
-    total: int
     page: int
     page_size: int
-    total_pages: int
+    # Counting needs a second query, so totals are only filled in on request
+    total: Optional[int] = None
+    total_pages: Optional[int] = None
 
 # User-specific alert actions
 class AlertActionRequest(BaseModel):
@@ -90,4 +90,7 @@ class SnoozeAlertRequest(AlertActionRequest):
     pass
 
 class MarkReadRequest(AlertActionRequest):
-    pass
\ No newline at end of file
+    pass
+
+class MarkAlertsReadRequest(BaseModel):
+    alert_ids: List[int] = Field(..., min_length=1, max_length=500)
\ No newline at end of file
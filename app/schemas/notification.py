@@ -1,6 +1,6 @@
 # app/schemas/notification.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -39,5 +39,7 @@ class NotificationResponse(BaseModel):
     
     created_at: datetime
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class MarkNotificationsReadRequest(BaseModel):
+    notification_ids: List[int] = Field(..., min_length=1, max_length=500)
@@ -1,5 +1,5 @@
 # app/schemas/team.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
@@ -22,5 +22,4 @@ class TeamResponse(TeamBase):
     updated_at: datetime
     member_count: Optional[int] = 0
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
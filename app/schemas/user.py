@@ -1,8 +1,16 @@
 # app/schemas/user.py
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from typing import Optional, Annotated
 from datetime import datetime
 
+# Email syntax check as a single regex match inside pydantic-core, instead
+# of the email-validator package's pure-Python parser
+EmailStr = Annotated[str, StringConstraints(
+    strip_whitespace=True,
+    max_length=254,
+    pattern=r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
+)]
+
 class UserBase(BaseModel):
     name: str
     email: EmailStr
@@ -24,9 +32,10 @@ class UserLogin(BaseModel):
     email: EmailStr
 
 class UserResponse(UserBase):
+    # Stored emails were validated on the way in
+    email: str
     id: int
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,16 +1,64 @@
 # app/services/alert_service.py
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import Optional, List, Dict
-from datetime import datetime, timedelta
-import json
-from app.models.alert import Alert, SeverityLevel, VisibilityType, AlertStatus
+import orjson
+from sqlalchemy.orm import Session, aliased, selectinload, joinedload, contains_eager
+from sqlalchemy import and_, or_, func, insert, update, delete, exists, literal, select, tuple_
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime, timedelta, timezone
+from app.core.cache import TTLCache, user_cache, analytics_cache
+from app.core.config import settings
+from app.models.alert import Alert, AlertEngagementCount, SeverityLevel, VisibilityType, AlertStatus, alert_target_teams, alert_target_users
 from app.models.user import User
 from app.models.team import Team
 from app.models.user_alert_preference import UserAlertPreference
 from app.schemas.alert import AlertCreate, AlertUpdate
 from .base_service import BaseService
 
+# Serialized per-user alert feeds for polling clients. Entries are keyed on a
+# per-user version that read/snooze bump; alert changes that can affect many
+# users clear the whole cache. Both the cache and the versions are
+# per-process: a write only invalidates the worker that handled it, so with
+# several workers another one can serve a stale feed (an alert the user just
+# read still unread) for up to ALERT_FEED_CACHE_TTL_SECONDS. Lower the TTL,
+# or set it to 0 to disable caching, when that matters more than the load.
+_feed_cache = TTLCache(maxsize=10_000, ttl=settings.alert_feed_cache_ttl_seconds)
+_feed_versions: Dict[int, int] = {}
+
+# IDs of the active alerts each user can see, keyed on (user_id, team_id).
+# Read/snooze leave visibility alone, so these outlive feed pages and let
+# page and count queries use a primary key IN lookup instead of the
+# visibility OR-filter. Per-process like _feed_cache, with the same TTL.
+_visible_ids_cache = TTLCache(maxsize=10_000, ttl=settings.alert_feed_cache_ttl_seconds)
+_MAX_VISIBLE_IDS = 2000
+
+def _invalidate_user_feed(user_id: int, alert_ids=()) -> None:
+    _feed_versions[user_id] = _feed_versions.get(user_id, 0) + 1
+    # The user's own engagement numbers, and those of the alerts they read
+    # or snoozed, move with their reads and snoozes
+    analytics_cache.invalidate(('user', user_id))
+    for alert_id in alert_ids:
+        analytics_cache.invalidate(('alert', alert_id))
+
+def _invalidate_all_feeds() -> None:
+    _feed_cache.clear()
+    _visible_ids_cache.clear()
+
+# Dict keys of a user feed row, in the column order get_alerts_for_user
+# selects; every row is a dict(zip()) over these same key objects
+_USER_FEED_KEYS = (
+    'id', 'title', 'message', 'severity', 'start_time', 'expiry_time', 'is_active',
+    'created_at', 'is_read', 'is_snoozed', 'snoozed_until', 'read_at'
+)
+
+# Severity members to their API strings, a dict probe per feed row
+_SEVERITY_VALUES = {member: member.value for member in SeverityLevel}
+
+# Batch-load alert targets with one IN query per relationship, fetching only
+# the ids that AlertResponse exposes
+_TARGET_ID_OPTIONS = (
+    selectinload(Alert.target_teams).load_only(Team.id),
+    selectinload(Alert.target_users).load_only(User.id),
+)
+
 class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
     """
     Service class for Alert operations
@@ -29,11 +77,9 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
         alert_dict = alert_data.model_dump()
         alert_dict['created_by'] = created_by
         
-        # Convert target lists to JSON strings
-        if alert_dict.get('target_team_ids'):
-            alert_dict['target_team_ids'] = json.dumps(alert_dict['target_team_ids'])
-        if alert_dict.get('target_user_ids'):
-            alert_dict['target_user_ids'] = json.dumps(alert_dict['target_user_ids'])
+        # Target lists are stored in association tables, not on the row
+        target_team_ids = alert_dict.pop('target_team_ids', None)
+        target_user_ids = alert_dict.pop('target_user_ids', None)
         
         # Set default start time if not provided
         if not alert_dict.get('start_time'):
@@ -42,13 +88,17 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
         # Create the alert
         db_alert = Alert(**alert_dict)
         self.db.add(db_alert)
+        self.db.flush()
+        self._set_alert_targets(db_alert, target_team_ids, target_user_ids)
         self.db.commit()
-        self.db.refresh(db_alert)
         
         # Create initial user alert preferences for all target users
         self._create_user_preferences_for_alert(db_alert)
+        _invalidate_all_feeds()
         
-        return db_alert
+        # Reload with the target ids the response needs, rather than lazy
+        # loading each target list afterwards
+        return self.get_alert_with_targets(db_alert.id)
     
     def update_alert(self, alert_id: int, alert_data: AlertUpdate) -> Optional[Alert]:
         """Update alert with validation"""
@@ -60,113 +110,178 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
         if alert_data.visibility_type:
             self._validate_alert_targeting(alert_data)
         
-        # Convert target lists to JSON strings
         update_dict = alert_data.model_dump(exclude_unset=True)
-        if 'target_team_ids' in update_dict and update_dict['target_team_ids'] is not None:
-            update_dict['target_team_ids'] = json.dumps(update_dict['target_team_ids'])
-        if 'target_user_ids' in update_dict and update_dict['target_user_ids'] is not None:
-            update_dict['target_user_ids'] = json.dumps(update_dict['target_user_ids'])
+        targeting_changed = any(field in update_dict for field in ['visibility_type', 'target_team_ids', 'target_user_ids'])
+        
+        # Replace target lists in the association tables
+        self._set_alert_targets(
+            alert,
+            update_dict.pop('target_team_ids', None),
+            update_dict.pop('target_user_ids', None)
+        )
         
         # Update fields
         for field, value in update_dict.items():
             setattr(alert, field, value)
         
         self.db.commit()
-        self.db.refresh(alert)
         
         # If targeting changed, update user preferences
-        if any(field in update_dict for field in ['visibility_type', 'target_team_ids', 'target_user_ids']):
+        if targeting_changed:
             self._update_user_preferences_for_alert(alert)
+        _invalidate_all_feeds()
         
-        return alert
+        return self.get_alert_with_targets(alert_id)
     
     def get_alerts_for_user(self, user_id: int, include_read: bool = True, 
-                           skip: int = 0, limit: int = 100) -> List[Dict]:
-        """Get all alerts that should be visible to a specific user"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+                           skip: int = 0, limit: int = 100,
+                           after: Optional[Tuple[datetime, int]] = None) -> List[Dict]:
+        """
+        Get all alerts that should be visible to a specific user, newest first
+        Pass after=(created_at, id) of the last row seen to page by keyset
+        instead of offset
+        """
+        user = self._get_user(user_id)
         if not user:
             return []
         
-        query = self.db.query(Alert).filter(Alert.status == AlertStatus.ACTIVE)
-        
-        # Build visibility filter
-        visibility_filters = []
-        
-        # Organization-wide alerts
-        visibility_filters.append(Alert.visibility_type == VisibilityType.ORGANIZATION)
-        
-        # Team-specific alerts
-        if user.team_id:
-            visibility_filters.append(and_(
-                Alert.visibility_type == VisibilityType.TEAM,
-                Alert.target_team_ids.like(f'%{user.team_id}%')
-            ))
-        
-        # User-specific alerts
-        visibility_filters.append(and_(
-            Alert.visibility_type == VisibilityType.USER,
-            Alert.target_user_ids.like(f'%{user_id}%')
-        ))
-        
-        query = query.filter(or_(*visibility_filters))
-        
-        # Join with user preferences to get read/snooze status
-        query = (query.outerjoin(UserAlertPreference, and_(
-                    Alert.id == UserAlertPreference.alert_id,
-                    UserAlertPreference.user_id == user_id
-                ))
-                .add_columns(
-                    UserAlertPreference.is_read,
-                    UserAlertPreference.is_snoozed,
+        # Flat column rows skip ORM identity tracking; missing preferences
+        # read as neither read nor snoozed. Alert.is_active compares against
+        # the current time, so the columns are built per call.
+        query = (self.db.query(
+                    Alert.id,
+                    Alert.title,
+                    Alert.message,
+                    Alert.severity,
+                    Alert.start_time,
+                    Alert.expiry_time,
+                    Alert.is_active,
+                    Alert.created_at,
+                    func.coalesce(UserAlertPreference.is_read, False),
+                    func.coalesce(UserAlertPreference.is_snoozed, False),
                     UserAlertPreference.snoozed_until,
                     UserAlertPreference.read_at
+                )
+                .outerjoin(UserAlertPreference, and_(
+                    Alert.id == UserAlertPreference.alert_id,
+                    UserAlertPreference.user_id == user_id
                 ))
+                .filter(Alert.status == AlertStatus.ACTIVE)
+                .filter(self._visible_alerts_filter(user)))
         
-        # Filter by read status if requested
+        # Unread means no read preference exists: an anti-join answered from
+        # the partial index on read preferences, not a filter over the outer join
         if not include_read:
-            query = query.filter(or_(
-                UserAlertPreference.is_read == False,
-                UserAlertPreference.is_read.is_(None)
-            ))
-        
-        results = query.offset(skip).limit(limit).all()
-        
-        # Format results
-        alerts = []
-        for row in results:
-            alert = row[0]  # Alert object
-            is_read = row[1] if row[1] is not None else False
-            is_snoozed = row[2] if row[2] is not None else False
-            snoozed_until = row[3]
-            read_at = row[4]
-            
-            alert_dict = {
-                'id': alert.id,
-                'title': alert.title,
-                'message': alert.message,
-                'severity': alert.severity.value,
-                'start_time': alert.start_time,
-                'expiry_time': alert.expiry_time,
-                'is_active': alert.is_active,
-                'created_at': alert.created_at,
-                'is_read': is_read,
-                'is_snoozed': is_snoozed,
-                'snoozed_until': snoozed_until,
-                'read_at': read_at
-            }
-            alerts.append(alert_dict)
+            read_preference = aliased(UserAlertPreference)
+            query = query.filter(~exists().where(and_(
+                read_preference.alert_id == Alert.id,
+                read_preference.user_id == user_id,
+                read_preference.is_read == True
+            )))
+        
+        # id breaks ties between alerts created in the same second
+        query = query.order_by(Alert.created_at.desc(), Alert.id.desc())
+        
+        if after is not None:
+            after_ts, after_id = after
+            if self.db.get_bind().dialect.name == "sqlite":
+                # Match the text form of the CURRENT_TIMESTAMP default
+                after_ts = func.datetime(after_ts)
+            query = query.filter(tuple_(Alert.created_at, Alert.id) < tuple_(after_ts, after_id))
+        else:
+            query = query.offset(skip)
+        
+        alerts = [dict(zip(_USER_FEED_KEYS, row)) for row in query.limit(limit).yield_per(200)]
+        for alert in alerts:
+            alert['severity'] = _SEVERITY_VALUES[alert['severity']]
         
         return alerts
     
+    def get_alerts_for_user_json(self, user_id: int, include_read: bool = True,
+                                 skip: int = 0, limit: int = 100,
+                                 after: Optional[Tuple[datetime, int]] = None
+                                 ) -> Tuple[bytes, Optional[Tuple[datetime, int]]]:
+        """
+        Get a user's visible alerts as serialized JSON, cached until the feed changes
+        Also returns the (created_at, id) to pass as after for the next page,
+        or None on the last page
+        """
+        user = self._get_user(user_id)
+        if not user:
+            return b"[]", None
+        
+        # Visibility depends on the team, so a team move misses the cache
+        cache_key = (user_id, user.team_id, _feed_versions.get(user_id, 0), include_read, skip, limit, after)
+        page = _feed_cache.get(cache_key)
+        if page is None:
+            alerts = self.get_alerts_for_user(user_id, include_read, skip, limit, after)
+            next_after = (alerts[-1]['created_at'], alerts[-1]['id']) if len(alerts) == limit else None
+            page = (orjson.dumps(alerts), next_after)
+            _feed_cache.set(cache_key, page)
+        return page
+    
+    def get_alert_counts(self, user_id: int) -> Dict[str, int]:
+        """Get total/unread/read/snoozed counts of visible alerts in a single aggregate query"""
+        user = self._get_user(user_id)
+        if not user:
+            return {'total_alerts': 0, 'unread_alerts': 0, 'read_alerts': 0, 'snoozed_alerts': 0}
+        
+        total, read_count, snoozed_count = (
+            self.db.query(
+                func.count(Alert.id),
+                func.count().filter(UserAlertPreference.is_read == True),
+                func.count().filter(UserAlertPreference.is_snoozed == True)
+            )
+            .select_from(Alert)
+            .outerjoin(UserAlertPreference, and_(
+                Alert.id == UserAlertPreference.alert_id,
+                UserAlertPreference.user_id == user_id
+            ))
+            .filter(Alert.status == AlertStatus.ACTIVE)
+            .filter(self._visible_alerts_filter(user))
+            .one())
+        
+        return {
+            'total_alerts': total,
+            'unread_alerts': total - read_count,
+            'read_alerts': read_count,
+            'snoozed_alerts': snoozed_count
+        }
+    
     def mark_alert_as_read(self, alert_id: int, user_id: int) -> bool:
         """Mark an alert as read for a specific user"""
-        # Get or create user alert preference
-        preference = self._get_or_create_user_preference(alert_id, user_id)
-        if preference:
-            preference.mark_as_read()
-            self.db.commit()
-            return True
-        return False
+        return self.mark_alerts_as_read([alert_id], user_id) > 0
+    
+    def mark_alerts_as_read(self, alert_ids: List[int], user_id: int) -> int:
+        """
+        Mark several alerts as read for a user in one transaction
+        Returns the number of alerts marked; IDs of missing alerts are ignored
+        """
+        # Create preferences the user does not have yet, then mark them all
+        # read. Two set-based statements work on every dialect, unlike an
+        # upsert, and commit once for the whole batch.
+        already_exists = exists().where(and_(
+            UserAlertPreference.alert_id == Alert.id,
+            UserAlertPreference.user_id == user_id
+        ))
+        self.db.execute(
+            insert(UserAlertPreference).from_select(
+                ['user_id', 'alert_id'],
+                select(literal(user_id), Alert.id).where(and_(Alert.id.in_(alert_ids), ~already_exists))
+            )
+        )
+        result = self.db.execute(
+            update(UserAlertPreference)
+            .where(and_(
+                UserAlertPreference.user_id == user_id,
+                UserAlertPreference.alert_id.in_(alert_ids)
+            ))
+            .values(is_read=True, read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        _invalidate_user_feed(user_id, alert_ids)
+        return result.rowcount
     
     def snooze_alert_for_user(self, alert_id: int, user_id: int) -> bool:
         """Snooze an alert for a specific user until end of day"""
@@ -174,6 +289,7 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
         if preference:
             preference.snooze_for_day()
             self.db.commit()
+            _invalidate_user_feed(user_id, (alert_id,))
             return True
         return False
     
@@ -182,57 +298,132 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
                             created_by: Optional[int] = None,
                             skip: int = 0, limit: int = 100) -> List[Alert]:
         """Get alerts with optional filters"""
-        query = self.db.query(Alert)
+        query = (self._filter_alerts(self.db.query(Alert), severity, status, created_by)
+                 .options(*_TARGET_ID_OPTIONS))
         
+        return query.offset(skip).limit(limit).all()
+    
+    def get_alert_with_targets(self, alert_id: int) -> Optional[Alert]:
+        """Get an alert with its target team and user ids loaded"""
+        return (self.db.query(Alert)
+                .options(*_TARGET_ID_OPTIONS)
+                .filter(Alert.id == alert_id)
+                .first())
+    
+    def count_alerts_by_filters(self, severity: Optional[SeverityLevel] = None,
+                                status: Optional[AlertStatus] = None,
+                                created_by: Optional[int] = None) -> int:
+        """Count alerts matching the same filters as get_alerts_by_filters"""
+        query = self._filter_alerts(self.db.query(func.count(Alert.id)), severity, status, created_by)
+        return query.scalar()
+    
+    def _filter_alerts(self, query, severity: Optional[SeverityLevel],
+                       status: Optional[AlertStatus], created_by: Optional[int]):
+        """Apply the admin list filters to a query over alerts"""
         if severity:
             query = query.filter(Alert.severity == severity)
         if status:
             query = query.filter(Alert.status == status)
         if created_by:
             query = query.filter(Alert.created_by == created_by)
-        
-        return query.offset(skip).limit(limit).all()
+        return query
+    
+    def get_recipient_stats(self, alert_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """Get recipient/read/snooze counts for a batch of alerts from the engagement counters"""
+        if not alert_ids:
+            return {}
+        
+        rows = (self.db.query(
+                    AlertEngagementCount.alert_id,
+                    AlertEngagementCount.recipient_count,
+                    AlertEngagementCount.read_count,
+                    AlertEngagementCount.snoozed_count
+                )
+                .filter(AlertEngagementCount.alert_id.in_(alert_ids))
+                .all())
+        
+        return {
+            alert_id: {
+                'total_recipients': total,
+                'read_count': read_count,
+                'snoozed_count': snoozed_count
+            }
+            for alert_id, total, read_count, snoozed_count in rows
+        }
     
     def get_alerts_requiring_reminders(self) -> List[Dict]:
-        """Get alerts that need to send reminders to users"""
+        """
+        Get alerts that need to send reminders to users
+        Expired snoozes of the returned preferences are cleared, for the
+        caller to commit along with the reminders and then invalidate the
+        feeds listed under 'unsnoozed_user_ids'
+        """
         now = datetime.utcnow()
-        
-        # Get active alerts with reminders enabled
-        active_alerts = (self.db.query(Alert)
-                        .filter(and_(
-                            Alert.status == AlertStatus.ACTIVE,
-                            Alert.reminders_enabled == True,
-                            Alert.start_time <= now,
-                            or_(Alert.expiry_time.is_(None), Alert.expiry_time > now)
-                        ))
-                        .all())
-        
-        reminder_data = []
-        for alert in active_alerts:
-            # Get users who need reminders for this alert
-            users_needing_reminders = (self.db.query(UserAlertPreference)
-                                     .filter(and_(
-                                         UserAlertPreference.alert_id == alert.id,
-                                         UserAlertPreference.is_read == False,
-                                         or_(
-                                             UserAlertPreference.is_snoozed == False,
-                                             UserAlertPreference.snoozed_until < now
-                                         ),
-                                         or_(
-                                             UserAlertPreference.last_reminded_at.is_(None),
-                                             UserAlertPreference.last_reminded_at < 
-                                             (now - timedelta(hours=alert.reminder_interval_hours))
-                                         )
-                                     ))
-                                     .all())
-            
-            if users_needing_reminders:
-                reminder_data.append({
-                    'alert': alert,
-                    'users': users_needing_reminders
-                })
-        
-        return reminder_data
+        now_ts = now.replace(tzinfo=timezone.utc).timestamp()
+        
+        # One pass over unread, unsnoozed preferences of active alerts with
+        # reminders enabled. needs_reminder() below stays the authoritative
+        # check; SQL pre-filters on each alert's own interval where the
+        # dialect allows, otherwise on the shortest interval an alert can
+        # have (1 hour).
+        if self.db.get_bind().dialect.name == "sqlite":
+            hours_since_reminder = (func.julianday(now) - func.julianday(UserAlertPreference.last_reminded_at)) * 24
+            # Small tolerance so float rounding never drops a row Python would keep
+            reminder_due = hours_since_reminder >= Alert.reminder_interval_hours - 0.001
+        else:
+            reminder_due = UserAlertPreference.last_reminded_at < now - timedelta(hours=1)
+        
+        # The joined alert also fills each preference's alert relationship,
+        # and recipients come from the same statement, so the whole batch
+        # is one query rather than one get per row
+        rows = (self.db.query(UserAlertPreference, Alert)
+                .join(Alert, UserAlertPreference.alert_id == Alert.id)
+                .options(
+                    contains_eager(UserAlertPreference.alert),
+                    joinedload(UserAlertPreference.user)
+                )
+                .filter(and_(
+                    Alert.is_active,
+                    Alert.reminders_enabled == True,
+                    UserAlertPreference.is_read == False,
+                    or_(
+                        UserAlertPreference.is_snoozed == False,
+                        UserAlertPreference.snoozed_until < now
+                    ),
+                    or_(
+                        UserAlertPreference.last_reminded_at.is_(None),
+                        reminder_due
+                    )
+                ))
+                .order_by(Alert.id)
+                .all())
+        
+        reminder_data = {}
+        for preference, alert in rows:
+            if preference.needs_reminder(now_ts, alert.reminder_interval_hours * 3600):
+                entry = reminder_data.setdefault(alert.id, {'alert': alert, 'users': [], 'unsnoozed_user_ids': []})
+                entry['users'].append(preference)
+                # A snooze that lets a reminder through has run out
+                if preference.is_snoozed:
+                    preference.is_snoozed = False
+                    preference.snoozed_until = None
+                    entry['unsnoozed_user_ids'].append(preference.user_id)
+        
+        return list(reminder_data.values())
+    
+    def expire_alerts(self) -> int:
+        """Move active alerts past their expiry time to EXPIRED; returns how many changed"""
+        expired = (self.db.query(Alert)
+                   .filter(and_(
+                       Alert.status == AlertStatus.ACTIVE,
+                       Alert.expiry_time.isnot(None),
+                       Alert.expiry_time <= datetime.utcnow()
+                   ))
+                   .update({Alert.status: AlertStatus.EXPIRED}, synchronize_session=False))
+        self.db.commit()
+        if expired:
+            _invalidate_all_feeds()
+        return expired
     
     def archive_alert(self, alert_id: int) -> bool:
         """Archive an alert"""
@@ -240,83 +431,158 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
         if alert:
             alert.status = AlertStatus.ARCHIVED
             self.db.commit()
+            _invalidate_all_feeds()
             return True
         return False
     
+    def _get_user(self, user_id: int) -> Optional[User]:
+        """Get a user, preferring the authentication cache over a query"""
+        # Only id and team_id are read from the user, both of which the
+        # cached snapshot (dependencies.CurrentUser) carries
+        return user_cache.get(user_id) or self.db.get(User, user_id)
+    
+    def _visible_alerts_filter(self, user: User):
+        """Match the active alerts visible to a user, by ID once the set is cached"""
+        cache_key = (user.id, user.team_id)
+        visible_ids = _visible_ids_cache.get(cache_key)
+        if visible_ids is None:
+            ids = self.db.scalars(
+                select(Alert.id)
+                .where(Alert.status == AlertStatus.ACTIVE)
+                .where(self._visibility_filter(user))
+                .limit(_MAX_VISIBLE_IDS + 1)
+            ).all()
+            # False marks a set too large to bind as an IN list
+            visible_ids = tuple(ids) if len(ids) <= _MAX_VISIBLE_IDS else False
+            _visible_ids_cache.set(cache_key, visible_ids)
+        
+        if visible_ids is False:
+            return self._visibility_filter(user)
+        return Alert.id.in_(visible_ids)
+    
+    def _visibility_filter(self, user: User):
+        """Build the SQL condition matching alerts visible to a user"""
+        # Organization-wide alerts
+        visibility_filters = [Alert.visibility_type == VisibilityType.ORGANIZATION]
+        
+        # Targeted alerts are integer lookups on the (team_id, alert_id) and
+        # (user_id, alert_id) indexes of the association tables; the
+        # uncorrelated IN subqueries run once, not once per candidate alert
+        if user.team_id:
+            visibility_filters.append(and_(
+                Alert.visibility_type == VisibilityType.TEAM,
+                Alert.id.in_(
+                    select(alert_target_teams.c.alert_id)
+                    .where(alert_target_teams.c.team_id == user.team_id)
+                )
+            ))
+        
+        visibility_filters.append(and_(
+            Alert.visibility_type == VisibilityType.USER,
+            Alert.id.in_(
+                select(alert_target_users.c.alert_id)
+                .where(alert_target_users.c.user_id == user.id)
+            )
+        ))
+        
+        return or_(*visibility_filters)
+    
     def _validate_alert_targeting(self, alert_data):
         """Validate alert targeting based on visibility type"""
-        if alert_data.visibility_type == VisibilityType.TEAM:
+        # Request schemas carry their own str enums, so compare by value
+        if alert_data.visibility_type == VisibilityType.TEAM.value:
             if not alert_data.target_team_ids:
                 raise ValueError("Team IDs required for team-specific alerts")
-            # Validate team IDs exist
-            for team_id in alert_data.target_team_ids:
-                if not self.db.query(Team).filter(Team.id == team_id).first():
-                    raise ValueError(f"Team with ID {team_id} does not exist")
+            # Validate team IDs exist with one IN query
+            team_id = self._first_missing_id(Team, alert_data.target_team_ids)
+            if team_id is not None:
+                raise ValueError(f"Team with ID {team_id} does not exist")
         
-        elif alert_data.visibility_type == VisibilityType.USER:
+        elif alert_data.visibility_type == VisibilityType.USER.value:
             if not alert_data.target_user_ids:
                 raise ValueError("User IDs required for user-specific alerts")
-            # Validate user IDs exist
-            for user_id in alert_data.target_user_ids:
-                if not self.db.query(User).filter(User.id == user_id).first():
-                    raise ValueError(f"User with ID {user_id} does not exist")
+            # Validate user IDs exist with one IN query
+            user_id = self._first_missing_id(User, alert_data.target_user_ids)
+            if user_id is not None:
+                raise ValueError(f"User with ID {user_id} does not exist")
+    
+    def _first_missing_id(self, model, ids: List[int]) -> Optional[int]:
+        """Return the first of ids with no matching row, or None if all exist"""
+        found = {row_id for (row_id,) in self.db.query(model.id).filter(model.id.in_(ids))}
+        return next((row_id for row_id in ids if row_id not in found), None)
+    
+    def _set_alert_targets(self, alert: Alert, team_ids: Optional[List[int]], user_ids: Optional[List[int]]):
+        """Replace an alert's target teams/users; None leaves that list unchanged"""
+        if team_ids is not None:
+            self._replace_targets(alert_target_teams, 'team_id', Team, alert.id, team_ids)
+            self.db.expire(alert, ['target_teams'])
+        if user_ids is not None:
+            self._replace_targets(alert_target_users, 'user_id', User, alert.id, user_ids)
+            self.db.expire(alert, ['target_users'])
+    
+    def _replace_targets(self, table, key: str, model, alert_id: int, ids: List[int]):
+        """Rewrite one association table's rows for an alert with bulk statements"""
+        self.db.execute(table.delete().where(table.c.alert_id == alert_id))
+        
+        # Unknown ids are dropped, as assigning the relationship used to do
+        found = {row_id for (row_id,) in self.db.query(model.id).filter(model.id.in_(ids))}
+        rows = [{'alert_id': alert_id, key: row_id} for row_id in dict.fromkeys(ids) if row_id in found]
+        if rows:
+            self.db.execute(insert(table), rows)
     
     def _create_user_preferences_for_alert(self, alert: Alert):
         """Create user alert preferences for all target users of an alert"""
-        target_users = self._get_target_users_for_alert(alert)
-        
-        for user in target_users:
-            # Check if preference already exists
-            existing = (self.db.query(UserAlertPreference)
-                       .filter(and_(
-                           UserAlertPreference.user_id == user.id,
-                           UserAlertPreference.alert_id == alert.id
-                       ))
-                       .first())
-            
-            if not existing:
-                preference = UserAlertPreference(
-                    user_id=user.id,
-                    alert_id=alert.id
-                )
-                self.db.add(preference)
-        
+        target_user_ids = self._target_user_ids_query(alert)
+        if target_user_ids is None:
+            return
+        
+        # A single INSERT ... SELECT builds every recipient's row in the
+        # database, skipping users that already have one for this alert
+        already_exists = exists().where(and_(
+            UserAlertPreference.alert_id == alert.id,
+            UserAlertPreference.user_id == User.id
+        ))
+        self.db.execute(
+            insert(UserAlertPreference).from_select(
+                ['user_id', 'alert_id'],
+                target_user_ids.add_columns(literal(alert.id)).where(~already_exists)
+            )
+        )
         self.db.commit()
     
     def _update_user_preferences_for_alert(self, alert: Alert):
         """Update user preferences when alert targeting changes"""
-        # Delete existing preferences
-        self.db.query(UserAlertPreference).filter(
-            UserAlertPreference.alert_id == alert.id
-        ).delete()
-        
-        # Create new preferences
+        # Only drop preferences of users who are no longer targeted, so
+        # recipients that stay keep their read/snooze state
+        stale = UserAlertPreference.alert_id == alert.id
+        target_user_ids = self._target_user_ids_query(alert)
+        if target_user_ids is not None:
+            stale = and_(stale, UserAlertPreference.user_id.not_in(target_user_ids))
+        self.db.execute(delete(UserAlertPreference).where(stale))
+        
+        # Add preferences for newly targeted users; this commits both
+        # statements together unless nobody is targeted
         self._create_user_preferences_for_alert(alert)
+        self.db.commit()
     
-    def _get_target_users_for_alert(self, alert: Alert) -> List[User]:
-        """Get all users who should receive this alert"""
+    def _target_user_ids_query(self, alert: Alert):
+        """SELECT of the ids of all users who should receive this alert, or None"""
+        query = select(User.id).where(User.is_active == True)
+        
         if alert.visibility_type == VisibilityType.ORGANIZATION:
-            return self.db.query(User).filter(User.is_active == True).all()
+            return query
         
         elif alert.visibility_type == VisibilityType.TEAM:
-            team_ids = json.loads(alert.target_team_ids) if alert.target_team_ids else []
-            return (self.db.query(User)
-                   .filter(and_(
-                       User.is_active == True,
-                       User.team_id.in_(team_ids)
-                   ))
-                   .all())
+            return query.where(User.team_id.in_(
+                select(alert_target_teams.c.team_id).where(alert_target_teams.c.alert_id == alert.id)
+            ))
         
         elif alert.visibility_type == VisibilityType.USER:
-            user_ids = json.loads(alert.target_user_ids) if alert.target_user_ids else []
-            return (self.db.query(User)
-                   .filter(and_(
-                       User.is_active == True,
-                       User.id.in_(user_ids)
-                   ))
-                   .all())
+            return query.where(User.id.in_(
+                select(alert_target_users.c.user_id).where(alert_target_users.c.alert_id == alert.id)
+            ))
         
-        return []
+        return None
     
     def _get_or_create_user_preference(self, alert_id: int, user_id: int) -> Optional[UserAlertPreference]:
         """Get or create user alert preference"""
@@ -330,7 +596,7 @@ class AlertService(BaseService[Alert, AlertCreate, AlertUpdate]):
         if not preference:
             # Verify alert and user exist
             alert = self.get_by_id(alert_id)
-            user = self.db.query(User).filter(User.id == user_id).first()
+            user = self._get_user(user_id)
             
             if alert and user:
                 preference = UserAlertPreference(
@@ -1,18 +1,91 @@
 # app/services/analytics_service.py
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import Integer, cast, func, and_, or_, literal, select, union_all
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from app.models.alert import Alert, SeverityLevel, AlertStatus
+from app.core.cache import count_cache, analytics_cache
+from app.core.config import settings
+from app.models.alert import Alert, AlertEngagementCount, SeverityLevel, AlertStatus
 from app.models.user import User
 from app.models.team import Team
 from app.models.notification_delivery import NotificationDelivery, DeliveryStatus
 from app.models.user_alert_preference import UserAlertPreference
+from app.models.analytics_snapshot import AnalyticsSnapshot
 from app.schemas.analytics import (
     AnalyticsResponse, SeverityBreakdown, AlertStatusBreakdown,
     DeliveryStats, SnoozeStats, TopAlert
 )
 
+# Row count above which user and team totals are served from count_cache
+COUNT_CACHE_MIN_ROWS = 1000
+
+# Entity fetches below only read columns; every count comes from an
+# aggregate query, so touching a relationship is a bug and should raise
+_NO_RELATIONSHIPS = [raiseload('*')]
+
+# The report's table-wide aggregates are independent, so three of them run
+# on their own pooled connections while the request thread runs the fourth
+_report_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="analytics-report")
+
+def _count_where(condition):
+    """Conditional COUNT for fusing several counts into one aggregate query"""
+    # COUNT(*) FILTER (WHERE ...) skips the per-row CASE and is 0, not NULL,
+    # over no rows
+    return func.count().filter(condition)
+
+def _delivery_totals(condition):
+    """Total and successful deliveries and reminders sent per alert, for per-alert metrics"""
+    # A repeat reminder refreshes the user's unread reminder row in place,
+    # raising its reminder_sequence, so reminder rows undercount reminders;
+    # the highest sequence per user is the number that user was sent. Older
+    # reminders were written one row each without a sequence, so a user with
+    # only those counts their rows instead.
+    per_user = (select(
+                    NotificationDelivery.alert_id,
+                    func.count(NotificationDelivery.id).label('total'),
+                    _count_where(NotificationDelivery.status.in_([
+                        DeliveryStatus.DELIVERED,
+                        DeliveryStatus.READ
+                    ])).label('successful'),
+                    func.coalesce(
+                        func.max(NotificationDelivery.reminder_sequence)
+                        .filter(NotificationDelivery.is_reminder == True),
+                        _count_where(NotificationDelivery.is_reminder == True)
+                    ).label('reminders')
+                )
+                .where(condition)
+                .group_by(NotificationDelivery.alert_id, NotificationDelivery.user_id)
+                .subquery())
+    return (select(
+                per_user.c.alert_id,
+                cast(func.sum(per_user.c.total), Integer),
+                cast(func.sum(per_user.c.successful), Integer),
+                cast(func.coalesce(func.sum(per_user.c.reminders), 0), Integer)
+            )
+            .group_by(per_user.c.alert_id))
+
+def _alert_metrics(alert_id: int, title: str, severity: SeverityLevel, created_at: datetime,
+                   total_recipients: int, read_count: int, snoozed_count: int,
+                   total_deliveries: int, successful_deliveries: int, total_reminders: int) -> Dict:
+    """Build an alert's performance metrics from its raw counts"""
+    return {
+        'alert_id': alert_id,
+        'alert_title': title,
+        'alert_severity': severity.value,
+        'created_at': created_at,
+        'total_recipients': total_recipients,
+        'read_count': read_count,
+        'snoozed_count': snoozed_count,
+        'read_rate': (read_count / total_recipients * 100) if total_recipients > 0 else 0,
+        'snooze_rate': (snoozed_count / total_recipients * 100) if total_recipients > 0 else 0,
+        'total_deliveries': total_deliveries,
+        'successful_deliveries': successful_deliveries,
+        'delivery_success_rate': (successful_deliveries / total_deliveries * 100) if total_deliveries > 0 else 0,
+        'total_reminders': total_reminders,
+        'average_reminders_per_user': (total_reminders / total_recipients) if total_recipients > 0 else 0
+    }
+
 class AnalyticsService:
     """
     Service for generating analytics and metrics
@@ -24,141 +97,173 @@ class AnalyticsService:
     
     def generate_analytics_report(self) -> AnalyticsResponse:
         """Generate comprehensive analytics report"""
+        # Each table is aggregated once, concurrently; the sections below
+        # read from these rows
+        preference_future = _report_executor.submit(self._in_own_session, '_get_preference_totals')
+        top_alerts_future = _report_executor.submit(self._in_own_session, '_get_top_alerts')
+        delivery_future = _report_executor.submit(self._in_own_session, '_get_delivery_stats')
+        alert_totals = self._get_alert_totals()
+        preference_totals = preference_future.result()
+        most_read_alerts, most_snoozed_alerts = top_alerts_future.result()
+        
         return AnalyticsResponse(
             # Overview metrics
-            total_alerts_created=self._get_total_alerts_created(),
-            active_alerts=self._get_active_alerts_count(),
+            total_alerts_created=alert_totals.total,
+            active_alerts=alert_totals.active,
             total_users=self._get_total_users_count(),
             total_teams=self._get_total_teams_count(),
             
             # Alert breakdown
-            alerts_by_severity=self._get_alerts_by_severity(),
-            alerts_by_status=self._get_alerts_by_status(),
+            alerts_by_severity=SeverityBreakdown(
+                info=alert_totals.info,
+                warning=alert_totals.warning,
+                critical=alert_totals.critical
+            ),
+            alerts_by_status=AlertStatusBreakdown(
+                active=alert_totals.active,
+                expired=alert_totals.expired,
+                archived=alert_totals.archived
+            ),
             
             # Delivery & engagement
-            delivery_stats=self._get_delivery_stats(),
-            snooze_stats=self._get_snooze_stats(),
+            delivery_stats=delivery_future.result(),
+            snooze_stats=self._get_snooze_stats(preference_totals, alert_totals.total),
             
             # Top performing alerts
-            most_read_alerts=self._get_most_read_alerts(),
-            most_snoozed_alerts=self._get_most_snoozed_alerts(),
+            most_read_alerts=most_read_alerts,
+            most_snoozed_alerts=most_snoozed_alerts,
             
             # Time-based stats
-            alerts_created_today=self._get_alerts_created_today(),
-            alerts_created_this_week=self._get_alerts_created_this_week(),
-            alerts_created_this_month=self._get_alerts_created_this_month(),
+            alerts_created_today=alert_totals.today,
+            alerts_created_this_week=alert_totals.week,
+            alerts_created_this_month=alert_totals.month,
             
             # Response rates
-            overall_read_rate=self._get_overall_read_rate(),
-            overall_snooze_rate=self._get_overall_snooze_rate(),
+            overall_read_rate=self._get_overall_read_rate(preference_totals),
+            overall_snooze_rate=self._get_overall_snooze_rate(preference_totals),
             
             generated_at=datetime.utcnow()
         )
     
+    def refresh_snapshot(self) -> AnalyticsResponse:
+        """Compute the analytics report and store it as the latest snapshot"""
+        report = self.generate_analytics_report()
+        snapshot = AnalyticsSnapshot(
+            generated_at=report.generated_at,
+            payload=report.model_dump_json()
+        )
+        self.db.add(snapshot)
+        self.db.flush()
+        
+        # Only the latest snapshot is ever read
+        (self.db.query(AnalyticsSnapshot)
+         .filter(AnalyticsSnapshot.id < snapshot.id)
+         .delete(synchronize_session=False))
+        self.db.commit()
+        return report
+    
+    def get_dashboard_json(self, max_age_seconds: Optional[int] = None) -> str:
+        """
+        Get the analytics dashboard as JSON from the latest snapshot
+        Recomputes it on the request path only if the snapshot is missing
+        or older than max_age_seconds
+        """
+        if max_age_seconds is None:
+            max_age_seconds = settings.analytics_snapshot_max_age_seconds
+        
+        snapshot = (self.db.query(AnalyticsSnapshot)
+                    .order_by(AnalyticsSnapshot.id.desc())
+                    .first())
+        if snapshot and datetime.utcnow() - snapshot.generated_at <= timedelta(seconds=max_age_seconds):
+            return snapshot.payload
+        
+        return self.refresh_snapshot().model_dump_json()
+    
     def get_alert_performance_metrics(self, alert_id: int) -> Dict:
         """Get detailed performance metrics for a specific alert"""
-        alert = self.db.query(Alert).filter(Alert.id == alert_id).first()
+        return self._cached(('alert', alert_id), lambda: self._compute_alert_performance_metrics(alert_id))
+    
+    def get_alert_performance_metrics_bulk(self, alert_ids: List[int]) -> List[Dict]:
+        """
+        Get performance metrics for many alerts in two queries
+        Returned in the order requested; unknown IDs are left out
+        """
+        if not alert_ids:
+            return []
+        
+        # Alert columns with their engagement counters, then the delivery
+        # aggregates for all of them grouped by alert
+        alerts = (self.db.query(
+                      Alert.id,
+                      Alert.title,
+                      Alert.severity,
+                      Alert.created_at,
+                      func.coalesce(AlertEngagementCount.recipient_count, 0),
+                      func.coalesce(AlertEngagementCount.read_count, 0),
+                      func.coalesce(AlertEngagementCount.snoozed_count, 0)
+                  )
+                  .outerjoin(AlertEngagementCount, AlertEngagementCount.alert_id == Alert.id)
+                  .filter(Alert.id.in_(alert_ids))
+                  .all())
+        if not alerts:
+            return []
+        
+        deliveries = {
+            alert_id: totals
+            for alert_id, *totals in (
+                self.db.execute(_delivery_totals(NotificationDelivery.alert_id.in_([row[0] for row in alerts])))
+                .all())
+        }
+        
+        metrics = {
+            alert_id: _alert_metrics(alert_id, title, severity, created_at, *engagement,
+                                     *deliveries.get(alert_id, (0, 0, 0)))
+            for alert_id, title, severity, created_at, *engagement in alerts
+        }
+        return [metrics[alert_id] for alert_id in dict.fromkeys(alert_ids) if alert_id in metrics]
+    
+    def _compute_alert_performance_metrics(self, alert_id: int) -> Dict:
+        alert = self.db.get(Alert, alert_id, options=_NO_RELATIONSHIPS)
         if not alert:
             return {}
         
-        # Basic stats
-        total_recipients = (self.db.query(UserAlertPreference)
-                          .filter(UserAlertPreference.alert_id == alert_id)
-                          .count())
-        
-        read_count = (self.db.query(UserAlertPreference)
-                     .filter(and_(
-                         UserAlertPreference.alert_id == alert_id,
-                         UserAlertPreference.is_read == True
-                     ))
-                     .count())
-        
-        snoozed_count = (self.db.query(UserAlertPreference)
-                        .filter(and_(
-                            UserAlertPreference.alert_id == alert_id,
-                            UserAlertPreference.is_snoozed == True
-                        ))
-                        .count())
-        
-        # Delivery stats
-        total_deliveries = (self.db.query(NotificationDelivery)
-                           .filter(NotificationDelivery.alert_id == alert_id)
-                           .count())
-        
-        successful_deliveries = (self.db.query(NotificationDelivery)
-                                .filter(and_(
-                                    NotificationDelivery.alert_id == alert_id,
-                                    NotificationDelivery.status.in_([
-                                        DeliveryStatus.DELIVERED,
-                                        DeliveryStatus.READ
-                                    ])
-                                ))
-                                .count())
-        
-        # Reminder stats
-        total_reminders = (self.db.query(NotificationDelivery)
-                          .filter(and_(
-                              NotificationDelivery.alert_id == alert_id,
-                              NotificationDelivery.is_reminder == True
-                          ))
-                          .count())
-        
-        return {
-            'alert_id': alert_id,
-            'alert_title': alert.title,
-            'alert_severity': alert.severity.value,
-            'created_at': alert.created_at,
-            'total_recipients': total_recipients,
-            'read_count': read_count,
-            'snoozed_count': snoozed_count,
-            'read_rate': (read_count / total_recipients * 100) if total_recipients > 0 else 0,
-            'snooze_rate': (snoozed_count / total_recipients * 100) if total_recipients > 0 else 0,
-            'total_deliveries': total_deliveries,
-            'successful_deliveries': successful_deliveries,
-            'delivery_success_rate': (successful_deliveries / total_deliveries * 100) if total_deliveries > 0 else 0,
-            'total_reminders': total_reminders,
-            'average_reminders_per_user': (total_reminders / total_recipients) if total_recipients > 0 else 0
-        }
+        # Recipient stats come from the trigger-maintained counters; delivery
+        # stats are one conditional aggregate
+        engagement = self.db.get(AlertEngagementCount, alert_id)
+        _, total_deliveries, successful_deliveries, total_reminders = (
+            self.db.execute(_delivery_totals(NotificationDelivery.alert_id == alert_id)).first()
+            or (alert_id, 0, 0, 0))
+        
+        return _alert_metrics(
+            alert_id, alert.title, alert.severity, alert.created_at,
+            engagement.recipient_count if engagement else 0,
+            engagement.read_count if engagement else 0,
+            engagement.snoozed_count if engagement else 0,
+            total_deliveries, successful_deliveries, total_reminders
+        )
     
     def get_user_engagement_metrics(self, user_id: int) -> Dict:
         """Get engagement metrics for a specific user"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        return self._cached(('user', user_id), lambda: self._compute_user_engagement_metrics(user_id))
+    
+    def _compute_user_engagement_metrics(self, user_id: int) -> Dict:
+        user = self.db.get(User, user_id, options=_NO_RELATIONSHIPS)
         if not user:
             return {}
         
-        # Alert interaction stats
-        total_alerts_received = (self.db.query(UserAlertPreference)
-                               .filter(UserAlertPreference.user_id == user_id)
-                               .count())
-        
-        alerts_read = (self.db.query(UserAlertPreference)
-                      .filter(and_(
-                          UserAlertPreference.user_id == user_id,
-                          UserAlertPreference.is_read == True
-                      ))
-                      .count())
-        
-        alerts_snoozed = (self.db.query(UserAlertPreference)
-                         .filter(UserAlertPreference.user_id == user_id)
-                         .with_entities(func.sum(UserAlertPreference.snooze_count))
-                         .scalar()) or 0
-        
-        # Recent activity (last 30 days)
+        # Alert interaction stats, overall and for the last 30 days
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_alerts = (self.db.query(UserAlertPreference)
-                        .join(Alert, UserAlertPreference.alert_id == Alert.id)
-                        .filter(and_(
-                            UserAlertPreference.user_id == user_id,
-                            Alert.created_at >= thirty_days_ago
-                        ))
-                        .count())
-        
-        recent_reads = (self.db.query(UserAlertPreference)
-                       .filter(and_(
-                           UserAlertPreference.user_id == user_id,
-                           UserAlertPreference.read_at >= thirty_days_ago
-                       ))
-                       .count()) if thirty_days_ago else 0
+        total_alerts_received, alerts_read, alerts_snoozed, recent_alerts, recent_reads = (
+            self.db.query(
+                func.count(UserAlertPreference.id),
+                _count_where(UserAlertPreference.is_read == True),
+                func.coalesce(func.sum(UserAlertPreference.snooze_count), 0),
+                _count_where(Alert.created_at >= thirty_days_ago),
+                _count_where(UserAlertPreference.read_at >= thirty_days_ago)
+            )
+            .outerjoin(Alert, UserAlertPreference.alert_id == Alert.id)
+            .filter(UserAlertPreference.user_id == user_id)
+            .one())
         
         return {
             'user_id': user_id,
@@ -177,18 +282,28 @@ class AnalyticsService:
     
     def get_team_analytics(self, team_id: int) -> Dict:
         """Get analytics for a specific team"""
-        team = self.db.query(Team).filter(Team.id == team_id).first()
+        return self._cached(('team', team_id), lambda: self._compute_team_analytics(team_id))
+    
+    def _compute_team_analytics(self, team_id: int) -> Dict:
+        team = self.db.get(Team, team_id, options=_NO_RELATIONSHIPS)
         if not team:
             return {}
         
-        # Team members
-        team_members = (self.db.query(User)
-                       .filter(and_(User.team_id == team_id, User.is_active == True))
-                       .all())
-        
-        member_ids = [member.id for member in team_members]
-        
-        if not member_ids:
+        # Members and their preferences in one join, filtered on the
+        # (team_id) WHERE is_active partial index
+        member_count, total_alerts, total_reads, total_snoozes = (
+            self.db.query(
+                func.count(func.distinct(User.id)),
+                func.count(UserAlertPreference.id),
+                _count_where(UserAlertPreference.is_read == True),
+                func.coalesce(func.sum(UserAlertPreference.snooze_count), 0)
+            )
+            .select_from(User)
+            .outerjoin(UserAlertPreference, UserAlertPreference.user_id == User.id)
+            .filter(and_(User.team_id == team_id, User.is_active == True))
+            .one())
+        
+        if not member_count:
             return {
                 'team_id': team_id,
                 'team_name': team.name,
@@ -198,99 +313,96 @@ class AnalyticsService:
                 'team_snooze_rate': 0
             }
         
-        # Aggregate team stats
-        total_alerts = (self.db.query(UserAlertPreference)
-                       .filter(UserAlertPreference.user_id.in_(member_ids))
-                       .count())
-        
-        total_reads = (self.db.query(UserAlertPreference)
-                      .filter(and_(
-                          UserAlertPreference.user_id.in_(member_ids),
-                          UserAlertPreference.is_read == True
-                      ))
-                      .count())
-        
-        total_snoozes = (self.db.query(UserAlertPreference)
-                        .filter(UserAlertPreference.user_id.in_(member_ids))
-                        .with_entities(func.sum(UserAlertPreference.snooze_count))
-                        .scalar()) or 0
-        
         return {
             'team_id': team_id,
             'team_name': team.name,
-            'member_count': len(team_members),
+            'member_count': member_count,
             'total_alerts_received': total_alerts,
             'total_reads': total_reads,
             'total_snoozes': total_snoozes,
             'team_read_rate': (total_reads / total_alerts * 100) if total_alerts > 0 else 0,
             'team_snooze_rate': (total_snoozes / total_alerts * 100) if total_alerts > 0 else 0,
-            'average_alerts_per_member': (total_alerts / len(team_members)) if team_members else 0,
-            'average_reads_per_member': (total_reads / len(team_members)) if team_members else 0
+            'average_alerts_per_member': total_alerts / member_count,
+            'average_reads_per_member': total_reads / member_count
         }
     
     # Private helper methods
-    def _get_total_alerts_created(self) -> int:
-        return self.db.query(Alert).count()
+    def _in_own_session(self, method_name: str):
+        """Run a read-only helper on a separate session, for use from _report_executor"""
+        # Sessions are not thread-safe, so each worker opens its own
+        # on the same engine and hands back only plain rows and schemas
+        with Session(self.db.get_bind()) as db:
+            return getattr(AnalyticsService(db), method_name)()
     
-    def _get_active_alerts_count(self) -> int:
-        return self.db.query(Alert).filter(Alert.status == AlertStatus.ACTIVE).count()
+    def _cached(self, key, compute) -> Dict:
+        """Serve per-entity metrics from analytics_cache, computing them on a miss"""
+        metrics = analytics_cache.get(key)
+        if metrics is None:
+            metrics = compute()
+            # Unknown ids return {}; leave those uncached so a new row shows up at once
+            if metrics:
+                analytics_cache.set(key, metrics)
+        return metrics
     
-    def _get_total_users_count(self) -> int:
-        return self.db.query(User).filter(User.is_active == True).count()
+    def _cached_count(self, key: str, query) -> int:
+        """COUNT a query, caching the result briefly once the table is large"""
+        count = count_cache.get(key)
+        if count is None:
+            count = query.count()
+            # Small counts are cheap and should stay exact
+            if count >= COUNT_CACHE_MIN_ROWS:
+                count_cache.set(key, count)
+        return count
     
-    def _get_total_teams_count(self) -> int:
-        return self.db.query(Team).filter(Team.is_active == True).count()
+    def _get_alert_totals(self):
+        """Count alerts overall and by severity, status and creation window in one query"""
+        now = datetime.utcnow()
+        today_start = datetime.combine(now.date(), datetime.min.time())
+        tomorrow_start = today_start + timedelta(days=1)
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        
+        return self.db.query(
+            func.count(Alert.id).label('total'),
+            _count_where(Alert.severity == SeverityLevel.INFO).label('info'),
+            _count_where(Alert.severity == SeverityLevel.WARNING).label('warning'),
+            _count_where(Alert.severity == SeverityLevel.CRITICAL).label('critical'),
+            _count_where(Alert.status == AlertStatus.ACTIVE).label('active'),
+            _count_where(Alert.status == AlertStatus.EXPIRED).label('expired'),
+            _count_where(Alert.status == AlertStatus.ARCHIVED).label('archived'),
+            # A plain range on created_at rather than DATE(created_at), so the
+            # predicate compares the stored value directly
+            _count_where(and_(Alert.created_at >= today_start, Alert.created_at < tomorrow_start)).label('today'),
+            _count_where(Alert.created_at >= week_ago).label('week'),
+            _count_where(Alert.created_at >= month_ago).label('month')
+        ).one()
     
-    def _get_alerts_by_severity(self) -> SeverityBreakdown:
-        severity_counts = (self.db.query(Alert.severity, func.count(Alert.id))
-                          .group_by(Alert.severity)
-                          .all())
-        
-        breakdown = SeverityBreakdown()
-        for severity, count in severity_counts:
-            if severity == SeverityLevel.INFO:
-                breakdown.info = count
-            elif severity == SeverityLevel.WARNING:
-                breakdown.warning = count
-            elif severity == SeverityLevel.CRITICAL:
-                breakdown.critical = count
-        
-        return breakdown
+    def _get_preference_totals(self):
+        """Aggregate read and snooze figures over all user alert preferences in one query"""
+        return self.db.query(
+            func.count(UserAlertPreference.id).label('total'),
+            _count_where(UserAlertPreference.is_read == True).label('read'),
+            func.coalesce(func.sum(UserAlertPreference.snooze_count), 0).label('snoozes'),
+            _count_where(and_(
+                UserAlertPreference.is_snoozed == True,
+                UserAlertPreference.snoozed_until > datetime.utcnow()
+            )).label('active_snoozes')
+        ).one()
     
-    def _get_alerts_by_status(self) -> AlertStatusBreakdown:
-        status_counts = (self.db.query(Alert.status, func.count(Alert.id))
-                        .group_by(Alert.status)
-                        .all())
-        
-        breakdown = AlertStatusBreakdown()
-        for status, count in status_counts:
-            if status == AlertStatus.ACTIVE:
-                breakdown.active = count
-            elif status == AlertStatus.EXPIRED:
-                breakdown.expired = count
-            elif status == AlertStatus.ARCHIVED:
-                breakdown.archived = count
-        
-        return breakdown
+    def _get_total_users_count(self) -> int:
+        return self._cached_count('users:active', self.db.query(User).filter(User.is_active == True))
+    
+    def _get_total_teams_count(self) -> int:
+        return self._cached_count('teams:active', self.db.query(Team).filter(Team.is_active == True))
     
     def _get_delivery_stats(self) -> DeliveryStats:
-        total_sent = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status.in_([
-                DeliveryStatus.SENT, DeliveryStatus.DELIVERED, DeliveryStatus.READ
-            ])
-        ).count()
-        
-        total_delivered = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status.in_([DeliveryStatus.DELIVERED, DeliveryStatus.READ])
-        ).count()
-        
-        total_read = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status == DeliveryStatus.READ
-        ).count()
-        
-        total_failed = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status == DeliveryStatus.FAILED
-        ).count()
+        status = NotificationDelivery.status
+        total_sent, total_delivered, total_read, total_failed = self.db.query(
+            _count_where(status.in_([DeliveryStatus.SENT, DeliveryStatus.DELIVERED, DeliveryStatus.READ])),
+            _count_where(status.in_([DeliveryStatus.DELIVERED, DeliveryStatus.READ])),
+            _count_where(status == DeliveryStatus.READ),
+            _count_where(status == DeliveryStatus.FAILED)
+        ).one()
         
         return DeliveryStats(
             total_sent=total_sent,
@@ -301,118 +413,69 @@ class AnalyticsService:
             read_rate=(total_read / total_delivered * 100) if total_delivered > 0 else 0
         )
     
-    def _get_snooze_stats(self) -> SnoozeStats:
-        total_snoozed = (self.db.query(UserAlertPreference)
-                        .with_entities(func.sum(UserAlertPreference.snooze_count))
-                        .scalar()) or 0
-        
-        active_snoozes = (self.db.query(UserAlertPreference)
-                         .filter(and_(
-                             UserAlertPreference.is_snoozed == True,
-                             UserAlertPreference.snoozed_until > datetime.utcnow()
-                         ))
-                         .count())
-        
-        total_alerts = self.db.query(Alert).count()
-        
+    def _get_snooze_stats(self, preference_totals, total_alerts: int) -> SnoozeStats:
         return SnoozeStats(
-            total_snoozed=total_snoozed,
-            active_snoozes=active_snoozes,
-            average_snoozes_per_alert=(total_snoozed / total_alerts) if total_alerts > 0 else 0
+            total_snoozed=preference_totals.snoozes,
+            active_snoozes=preference_totals.active_snoozes,
+            average_snoozes_per_alert=(preference_totals.snoozes / total_alerts) if total_alerts > 0 else 0
         )
     
-    def _get_most_read_alerts(self, limit: int = 5) -> List[TopAlert]:
-        results = (self.db.query(
-                    Alert.id,
-                    Alert.title,
-                    Alert.severity,
-                    Alert.created_at,
-                    func.count(UserAlertPreference.id).label('recipients'),
-                    func.sum(func.cast(UserAlertPreference.is_read, func.Integer)).label('read_count'),
-                    func.sum(UserAlertPreference.snooze_count).label('snooze_count')
-                )
-                .join(UserAlertPreference, Alert.id == UserAlertPreference.alert_id)
-                .group_by(Alert.id)
-                .order_by(func.sum(func.cast(UserAlertPreference.is_read, func.Integer)).desc())
-                .limit(limit)
-                .all())
-        
-        return [
-            TopAlert(
+    def _get_top_alerts(self, limit: int = 5) -> Tuple[List[TopAlert], List[TopAlert]]:
+        """Get the most read and most snoozed alerts from the engagement counters"""
+        # Both top-N lists are read off the counter indexes and returned
+        # together through UNION ALL
+        def top_by(ranking: str, column):
+            top = (select(
+                       AlertEngagementCount.alert_id,
+                       AlertEngagementCount.recipient_count,
+                       AlertEngagementCount.read_count,
+                       AlertEngagementCount.snooze_count
+                   )
+                   .where(AlertEngagementCount.recipient_count > 0)
+                   .order_by(column.desc(), AlertEngagementCount.alert_id)
+                   .limit(limit)
+                   .subquery())
+            return (select(
+                        literal(ranking).label('ranking'),
+                        Alert.id,
+                        Alert.title,
+                        Alert.severity,
+                        Alert.created_at,
+                        top.c.recipient_count,
+                        top.c.read_count,
+                        top.c.snooze_count
+                    )
+                    .join(top, top.c.alert_id == Alert.id))
+        
+        rows = self.db.execute(union_all(
+            top_by('read', AlertEngagementCount.read_count),
+            top_by('snoozed', AlertEngagementCount.snooze_count)
+        )).all()
+        
+        most_read, most_snoozed = [], []
+        for row in rows:
+            top_alert = TopAlert(
                 id=row.id,
                 title=row.title,
                 severity=row.severity.value,
-                recipients=row.recipients,
-                read_count=row.read_count or 0,
-                snooze_count=row.snooze_count or 0,
+                recipients=row.recipient_count,
+                read_count=row.read_count,
+                snooze_count=row.snooze_count,
                 created_at=row.created_at
-            ) for row in results
-        ]
-    
-    def _get_most_snoozed_alerts(self, limit: int = 5) -> List[TopAlert]:
-        results = (self.db.query(
-                    Alert.id,
-                    Alert.title,
-                    Alert.severity,
-                    Alert.created_at,
-                    func.count(UserAlertPreference.id).label('recipients'),
-                    func.sum(func.cast(UserAlertPreference.is_read, func.Integer)).label('read_count'),
-                    func.sum(UserAlertPreference.snooze_count).label('snooze_count')
-                )
-                .join(UserAlertPreference, Alert.id == UserAlertPreference.alert_id)
-                .group_by(Alert.id)
-                .order_by(func.sum(UserAlertPreference.snooze_count).desc())
-                .limit(limit)
-                .all())
+            )
+            (most_read if row.ranking == 'read' else most_snoozed).append(top_alert)
         
-        return [
-            TopAlert(
-                id=row.id,
-                title=row.title,
-                severity=row.severity.value,
-                recipients=row.recipients,
-                read_count=row.read_count or 0,
-                snooze_count=row.snooze_count or 0,
-                created_at=row.created_at
-            ) for row in results
-        ]
-    
-    def _get_alerts_created_today(self) -> int:
-        today = datetime.utcnow().date()
-        return (self.db.query(Alert)
-                .filter(func.date(Alert.created_at) == today)
-                .count())
-    
-    def _get_alerts_created_this_week(self) -> int:
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        return (self.db.query(Alert)
-                .filter(Alert.created_at >= week_ago)
-                .count())
-    
-    def _get_alerts_created_this_month(self) -> int:
-        month_ago = datetime.utcnow() - timedelta(days=30)
-        return (self.db.query(Alert)
-                .filter(Alert.created_at >= month_ago)
-                .count())
+        # UNION ALL does not promise to keep each branch's order
+        most_read.sort(key=lambda alert: (-alert.read_count, alert.id))
+        most_snoozed.sort(key=lambda alert: (-alert.snooze_count, alert.id))
+        return most_read, most_snoozed
     
-    def _get_overall_read_rate(self) -> float:
-        total_preferences = self.db.query(UserAlertPreference).count()
-        if total_preferences == 0:
+    def _get_overall_read_rate(self, preference_totals) -> float:
+        if preference_totals.total == 0:
             return 0.0
-        
-        read_preferences = (self.db.query(UserAlertPreference)
-                           .filter(UserAlertPreference.is_read == True)
-                           .count())
-        
-        return (read_preferences / total_preferences) * 100
+        return (preference_totals.read / preference_totals.total) * 100
     
-    def _get_overall_snooze_rate(self) -> float:
-        total_preferences = self.db.query(UserAlertPreference).count()
-        if total_preferences == 0:
+    def _get_overall_snooze_rate(self, preference_totals) -> float:
+        if preference_totals.total == 0:
             return 0.0
-        
-        total_snoozes = (self.db.query(UserAlertPreference)
-                        .with_entities(func.sum(UserAlertPreference.snooze_count))
-                        .scalar()) or 0
-        
-        return (total_snoozes / total_preferences) * 100
\ No newline at end of file
+        return (preference_totals.snoozes / preference_totals.total) * 100
@@ -1,5 +1,7 @@
 # app/services/base_service.py
 from abc import ABC, abstractmethod
+from sqlalchemy import inspect, insert, update, delete
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from typing import Generic, TypeVar, Type, List, Optional, Any
 from pydantic import BaseModel
@@ -8,6 +10,10 @@ T = TypeVar('T')  # Database model type
 CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
 UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 
+def _set_fields(obj_data: BaseModel) -> dict:
+    """Values of the fields explicitly set on a schema, read without a model_dump"""
+    return {name: getattr(obj_data, name) for name in obj_data.model_fields_set}
+
 class BaseService(ABC, Generic[T, CreateSchemaType, UpdateSchemaType]):
     """
     Base service class implementing common CRUD operations
@@ -19,8 +25,8 @@ class BaseService(ABC, Generic[T, CreateSchemaType, UpdateSchemaType]):
         self.model = model
     
     def get_by_id(self, id: int) -> Optional[T]:
-        """Get a single record by ID"""
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        """Get a single record by ID, from the session's identity map when already loaded"""
+        return self.db.get(self.model, id)
     
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Get all records with pagination"""
@@ -32,32 +38,82 @@ class BaseService(ABC, Generic[T, CreateSchemaType, UpdateSchemaType]):
     
     def create(self, obj_data: CreateSchemaType) -> T:
         """Create a new record"""
-        db_obj = self.model(**obj_data.model_dump())
+        # Unset fields fall back to the column defaults, which the create
+        # schemas mirror
+        db_obj = self.model(**_set_fields(obj_data))
         self.db.add(db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
         return db_obj
     
+    def create_many(self, objs_data: List[CreateSchemaType], ignore_conflicts: bool = False) -> List[T]:
+        """
+        Create many records with one multi-row INSERT and one commit
+        With ignore_conflicts, rows hitting a unique constraint are skipped
+        and only the newly inserted records are returned
+        """
+        if not objs_data:
+            return []
+        
+        if ignore_conflicts:
+            dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+            stmt = dialect.insert(self.model).on_conflict_do_nothing()
+        else:
+            stmt = insert(self.model)
+        
+        # Only the new IDs come back from the INSERT; entities are then loaded
+        # in one SELECT, as RETURNING cannot carry column_property expressions
+        # Every row carries the same keys so the INSERT stays one batch
+        fields = tuple(type(objs_data[0]).model_fields)
+        ids = self.db.scalars(
+            stmt.returning(self.model.id),
+            [{name: getattr(obj_data, name) for name in fields} for obj_data in objs_data]
+        ).all()
+        self.db.commit()
+        if not ids:
+            return []
+        return (self.db.query(self.model)
+                .filter(self.model.id.in_(ids))
+                .order_by(self.model.id)
+                .all())
+    
     def update(self, id: int, obj_data: UpdateSchemaType) -> Optional[T]:
-        """Update an existing record"""
-        db_obj = self.get_by_id(id)
-        if db_obj:
-            update_data = obj_data.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(db_obj, field, value)
-            self.db.commit()
-            self.db.refresh(db_obj)
-        return db_obj
+        """Update an existing record with a single UPDATE ... WHERE id statement"""
+        update_data = _set_fields(obj_data)
+        if not update_data:
+            return self.get_by_id(id)
+        
+        # An instance already in the session is synchronized in place; the
+        # commit expires it, so the returned object reloads on first access
+        result = self.db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**update_data)
+        )
+        self.db.commit()
+        if result.rowcount == 0:
+            return None
+        return self.get_by_id(id)
     
     def delete(self, id: int) -> bool:
-        """Delete a record by ID"""
-        db_obj = self.get_by_id(id)
-        if db_obj:
+        """Delete a record by ID with a single DELETE ... WHERE id statement"""
+        # ORM delete cascades only run on loaded instances, so models that
+        # rely on them keep the load-then-delete path
+        if any(rel.cascade.delete for rel in inspect(self.model).relationships):
+            db_obj = self.get_by_id(id)
+            if not db_obj:
+                return False
             self.db.delete(db_obj)
             self.db.commit()
             return True
-        return False
+        
+        result = self.db.execute(
+            delete(self.model)
+            .where(self.model.id == id)
+        )
+        self.db.commit()
+        return result.rowcount > 0
     
     def exists(self, id: int) -> bool:
-        """Check if record exists"""
-        return self.db.query(self.model).filter(self.model.id == id).first() is not None
\ No newline at end of file
+        """Check if record exists with a SELECT EXISTS, without loading the row"""
+        return self.db.query(self.db.query(self.model.id).filter(self.model.id == id).exists()).scalar()
\ No newline at end of file
@@ -1,14 +1,83 @@
 # app/services/notification_service.py
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional, Dict
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_, func, tuple_, case, literal, update, insert, bindparam
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
+from app.core.cache import analytics_cache
 from app.models.notification_delivery import NotificationDelivery, DeliveryStatus, DeliveryChannel
 from app.models.alert import Alert
 from app.models.user import User
 from app.models.user_alert_preference import UserAlertPreference
 
+# Columns of a user's notification feed row, in response order
+_FEED_COLUMNS = (
+    NotificationDelivery.id,
+    NotificationDelivery.alert_id,
+    Alert.title.label('alert_title'),
+    Alert.message.label('alert_message'),
+    Alert.severity.label('alert_severity'),
+    NotificationDelivery.channel,
+    NotificationDelivery.status,
+    NotificationDelivery.scheduled_at,
+    NotificationDelivery.sent_at,
+    NotificationDelivery.delivered_at,
+    NotificationDelivery.read_at,
+    NotificationDelivery.is_reminder,
+    NotificationDelivery.reminder_sequence,
+    # Missing preference rows read as unread and unsnoozed
+    func.coalesce(UserAlertPreference.is_read, False).label('is_read'),
+    func.coalesce(UserAlertPreference.is_snoozed, False).label('is_snoozed'),
+    UserAlertPreference.snoozed_until,
+    NotificationDelivery.created_at
+)
+_FEED_KEYS = tuple(column.key for column in _FEED_COLUMNS)
+
+# Fields a new delivery carries once built and sent, written by bulk INSERTs
+_DELIVERY_INSERT_KEYS = (
+    'alert_id', 'user_id', 'channel', 'status', 'scheduled_at', 'sent_at',
+    'delivered_at', 'delivery_address', 'error_message', 'is_reminder', 'reminder_sequence'
+)
+
+# Fields a repeat reminder refreshes on the user's unread reminder delivery
+_DELIVERY_REFRESH_KEYS = (
+    'status', 'scheduled_at', 'sent_at', 'delivered_at', 'error_message', 'reminder_sequence'
+)
+
+# Refreshes an unread reminder delivery with a repeat reminder's fields.
+# created_at is stamped by the database, in the same form as the column
+# default, so the row moves back to the top of the newest-first feed and
+# keyset cursors compare against it like any other row.
+_REFRESH_DELIVERY = (
+    update(NotificationDelivery.__table__)
+    .where(NotificationDelivery.id == bindparam("delivery_id"))
+    .values({
+        **{key: bindparam(f"new_{key}", type_=NotificationDelivery.__table__.c[key].type)
+           for key in _DELIVERY_REFRESH_KEYS},
+        'created_at': func.now()
+    })
+)
+
+# Marks a user's notifications read; built once since the read endpoints
+# run it on every call
+_MARK_READ = (
+    update(NotificationDelivery)
+    .where(and_(
+        NotificationDelivery.id.in_(bindparam("notification_ids", expanding=True)),
+        NotificationDelivery.user_id == bindparam("owner_id")
+    ))
+    .values(
+        read_at=bindparam("read_time", type_=NotificationDelivery.read_at.type),
+        # Only delivered notifications move to READ, as before
+        status=case(
+            (NotificationDelivery.status == DeliveryStatus.DELIVERED,
+             literal(DeliveryStatus.READ, NotificationDelivery.status.type)),
+            else_=NotificationDelivery.status
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
+
 # Strategy Pattern for different delivery channels
 class NotificationChannel(ABC):
     """Abstract base class for notification channels"""
@@ -73,51 +142,70 @@ class NotificationService:
     Uses Strategy pattern for different delivery channels
     """
     
+    # Channels are stateless, so one set is shared by every service instance
+    channels = {
+        DeliveryChannel.IN_APP: InAppChannel(),
+        DeliveryChannel.EMAIL: EmailChannel(),
+        DeliveryChannel.SMS: SMSChannel()
+    }
+    
+    # Channels whose sender can actually deliver; the email and SMS senders
+    # are placeholders that always fail, so no delivery row is written for
+    # them. Add a channel here once its sender is implemented.
+    implemented_channels = frozenset({DeliveryChannel.IN_APP})
+    
     def __init__(self, db: Session):
         self.db = db
-        self.channels = {
-            DeliveryChannel.IN_APP: InAppChannel(),
-            DeliveryChannel.EMAIL: EmailChannel(),
-            DeliveryChannel.SMS: SMSChannel()
-        }
     
     def schedule_notification(self, alert: Alert, user: User, 
                             channel: DeliveryChannel = DeliveryChannel.IN_APP,
                             is_reminder: bool = False,
                             reminder_sequence: int = None) -> NotificationDelivery:
         """Schedule a notification for delivery"""
+        if channel not in self.implemented_channels:
+            raise ValueError(f"Delivery channel not available: {channel.value}")
         
-        # Create delivery record
-        delivery = NotificationDelivery(
-            alert_id=alert.id,
-            user_id=user.id,
-            channel=channel,
-            status=DeliveryStatus.PENDING,
-            scheduled_at=datetime.utcnow(),
-            is_reminder=is_reminder,
-            reminder_sequence=reminder_sequence,
-            delivery_address=self._get_delivery_address(user, channel)
-        )
-        
+        delivery = self._new_delivery(alert, user, channel, is_reminder, reminder_sequence)
         self.db.add(delivery)
         self.db.commit()
-        self.db.refresh(delivery)
         
+        # No refresh: the session reloads the row on first attribute access
+        # after the commit, so callers that only need to schedule skip it
         return delivery
     
     def send_pending_notifications(self) -> Dict[str, int]:
         """Send all pending notifications"""
-        pending_notifications = (self.db.query(NotificationDelivery)
-                               .filter(NotificationDelivery.status == DeliveryStatus.PENDING)
-                               .all())
+        # An in-app "send" only stamps the row as delivered, so every pending
+        # in-app delivery is sent by one UPDATE
+        now = datetime.utcnow()
+        in_app_sent = self.db.execute(
+            update(NotificationDelivery)
+            .where(and_(
+                NotificationDelivery.status == DeliveryStatus.PENDING,
+                NotificationDelivery.channel == DeliveryChannel.IN_APP
+            ))
+            .values(status=DeliveryStatus.DELIVERED, sent_at=now, delivered_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
         
         results = {
-            'sent': 0,
+            'sent': in_app_sent,
             'failed': 0,
-            'total': len(pending_notifications)
+            'total': in_app_sent
         }
         
+        # Other channels go through their senders one by one, streamed in
+        # batches; all writes are flushed by the single commit after the loop
+        pending_notifications = (self.db.query(NotificationDelivery)
+                               .options(
+                                   joinedload(NotificationDelivery.alert),
+                                   joinedload(NotificationDelivery.user)
+                               )
+                               .filter(NotificationDelivery.status == DeliveryStatus.PENDING)
+                               .yield_per(500))
+        
         for delivery in pending_notifications:
+            results['total'] += 1
             if self._send_notification(delivery):
                 results['sent'] += 1
             else:
@@ -130,12 +218,20 @@ class NotificationService:
                                     channel: DeliveryChannel = DeliveryChannel.IN_APP,
                                     is_reminder: bool = False) -> bool:
         """Schedule and immediately send a notification"""
-        delivery = self.schedule_notification(alert, user, channel, is_reminder)
-        return self._send_notification(delivery)
+        if channel not in self.implemented_channels:
+            return False
+        
+        # Sending only stamps the record, so it is sent before it is added
+        # and the caller waits on a single INSERT
+        delivery = self._new_delivery(alert, user, channel, is_reminder)
+        success = self._send_notification(delivery, alert, user)
+        self.db.add(delivery)
+        self.db.commit()
+        return success
     
     def process_reminders(self) -> Dict[str, int]:
         """Process and send reminder notifications"""
-        from .alert_service import AlertService
+        from .alert_service import AlertService, _invalidate_user_feed
         
         alert_service = AlertService(self.db)
         reminder_data = alert_service.get_alerts_requiring_reminders()
@@ -146,20 +242,43 @@ class NotificationService:
             'alerts_processed': len(reminder_data)
         }
         
+        # A user's unread reminder for an alert is refreshed in place by the
+        # next reminder rather than joined by another row, so the feed holds
+        # at most one unread reminder per alert. The refresh moves it back to
+        # the top of the feed and raises its reminder_sequence, which
+        # analytics counts reminders from.
+        unread_reminders = self._unread_reminder_ids(reminder_data)
+        
+        # Recipients arrive already loaded with their preferences and every
+        # delivery is sent in memory, so new deliveries go out as a single
+        # executemany INSERT, refreshed ones as a single executemany UPDATE
+        new_deliveries = []
+        refreshed_deliveries = []
         for data in reminder_data:
             alert = data['alert']
             users_needing_reminders = data['users']
+            channel = DeliveryChannel(alert.delivery_type.value)
+            if channel not in self.implemented_channels:
+                continue
             
             for user_preference in users_needing_reminders:
-                user = self.db.query(User).filter(User.id == user_preference.user_id).first()
+                user = user_preference.user
                 if user:
                     # Calculate reminder sequence
                     reminder_count = user_preference.reminder_count + 1
                     
                     # Send reminder
-                    success = self.send_notification_immediately(
-                        alert, user, alert.delivery_type, is_reminder=True
-                    )
+                    delivery = self._new_delivery(alert, user, channel, is_reminder=True,
+                                                  reminder_sequence=reminder_count)
+                    success = self._send_notification(delivery, alert, user)
+                    
+                    unread_id = unread_reminders.get((alert.id, user.id))
+                    if success and unread_id is not None:
+                        refreshed = {f"new_{key}": getattr(delivery, key) for key in _DELIVERY_REFRESH_KEYS}
+                        refreshed['delivery_id'] = unread_id
+                        refreshed_deliveries.append(refreshed)
+                    else:
+                        new_deliveries.append({key: getattr(delivery, key) for key in _DELIVERY_INSERT_KEYS})
                     
                     if success:
                         # Update user preference
@@ -169,28 +288,40 @@ class NotificationService:
                         results['reminders_sent'] += 1
                         results['users_reminded'] += 1
         
+        if new_deliveries:
+            self.db.execute(insert(NotificationDelivery), new_deliveries)
+        if refreshed_deliveries:
+            self.db.execute(_REFRESH_DELIVERY, refreshed_deliveries)
         self.db.commit()
+        
+        # Cleared snoozes change those users' feeds, and new reminders the
+        # alerts' delivery metrics
+        for data in reminder_data:
+            alert_id = data['alert'].id
+            analytics_cache.invalidate(('alert', alert_id))
+            for user_id in data['unsnoozed_user_ids']:
+                _invalidate_user_feed(user_id, (alert_id,))
         return results
     
     def get_user_notifications(self, user_id: int, 
                              include_read: bool = True,
-                             skip: int = 0, limit: int = 50) -> List[Dict]:
-        """Get notifications for a specific user with alert details"""
-        query = (self.db.query(NotificationDelivery)
+                             skip: int = 0, limit: int = 50,
+                             after: Optional[Tuple[datetime, int]] = None) -> List[Dict]:
+        """
+        Get notifications for a specific user with alert details
+        Pass after=(created_at, id) of the last row seen to page by keyset
+        instead of offset
+        """
+        # Select the flat feed row directly instead of hydrating a
+        # NotificationDelivery entity per notification; the preference join
+        # is a probe on the (user_id, alert_id) unique index
+        query = (self.db.query(*_FEED_COLUMNS)
                 .join(Alert, NotificationDelivery.alert_id == Alert.id)
                 .outerjoin(UserAlertPreference, and_(
-                    UserAlertPreference.alert_id == Alert.id,
+                    UserAlertPreference.alert_id == NotificationDelivery.alert_id,
                     UserAlertPreference.user_id == user_id
                 ))
-                .filter(NotificationDelivery.user_id == user_id)
-                .add_columns(
-                    Alert.title,
-                    Alert.message,
-                    Alert.severity,
-                    UserAlertPreference.is_read,
-                    UserAlertPreference.is_snoozed,
-                    UserAlertPreference.snoozed_until
-                ))
+                .filter(NotificationDelivery.user_id == user_id))
         
         if not include_read:
             query = query.filter(or_(
@@ -198,83 +329,99 @@ class NotificationService:
                 UserAlertPreference.is_read.is_(None)
             ))
         
-        results = query.order_by(NotificationDelivery.created_at.desc()).offset(skip).limit(limit).all()
+        # id breaks ties between rows created in the same second, so pages
+        # don't overlap or skip rows
+        query = query.order_by(NotificationDelivery.created_at.desc(), NotificationDelivery.id.desc())
         
-        notifications = []
-        for row in results:
-            delivery = row[0]
-            alert_title = row[1]
-            alert_message = row[2]
-            alert_severity = row[3]
-            is_read = row[4] if row[4] is not None else False
-            is_snoozed = row[5] if row[5] is not None else False
-            snoozed_until = row[6]
-            
-            notifications.append({
-                'id': delivery.id,
-                'alert_id': delivery.alert_id,
-                'alert_title': alert_title,
-                'alert_message': alert_message,
-                'alert_severity': alert_severity.value if alert_severity else 'info',
-                'channel': delivery.channel.value,
-                'status': delivery.status.value,
-                'scheduled_at': delivery.scheduled_at,
-                'sent_at': delivery.sent_at,
-                'delivered_at': delivery.delivered_at,
-                'read_at': delivery.read_at,
-                'is_reminder': delivery.is_reminder,
-                'reminder_sequence': delivery.reminder_sequence,
-                'is_read': is_read,
-                'is_snoozed': is_snoozed,
-                'snoozed_until': snoozed_until,
-                'created_at': delivery.created_at
-            })
+        # Keyset pages start right after the last row of the previous page,
+        # an index range scan on (user_id, created_at, id) rather than
+        # reading and discarding skip rows
+        if after is not None:
+            after_ts, after_id = after
+            if self.db.get_bind().dialect.name == "sqlite":
+                # SQLite stores the CURRENT_TIMESTAMP default without fractional
+                # seconds, so bind the cursor in the same text form
+                after_ts = func.datetime(after_ts)
+            query = query.filter(
+                tuple_(NotificationDelivery.created_at, NotificationDelivery.id) < tuple_(after_ts, after_id)
+            )
+        else:
+            query = query.offset(skip)
+        
+        notifications = [dict(zip(_FEED_KEYS, row)) for row in query.limit(limit)]
+        for notification in notifications:
+            notification['alert_severity'] = notification['alert_severity'].value
+            notification['channel'] = notification['channel'].value
+            notification['status'] = notification['status'].value
         
         return notifications
     
     def mark_notification_as_read(self, notification_id: int, user_id: int) -> bool:
         """Mark a specific notification as read"""
-        delivery = (self.db.query(NotificationDelivery)
-                   .filter(and_(
-                       NotificationDelivery.id == notification_id,
-                       NotificationDelivery.user_id == user_id
-                   ))
-                   .first())
-        
-        if delivery:
-            delivery.read_at = datetime.utcnow()
-            if delivery.status == DeliveryStatus.DELIVERED:
-                delivery.status = DeliveryStatus.READ
-            self.db.commit()
-            return True
-        return False
+        return self.mark_notifications_as_read([notification_id], user_id) > 0
+    
+    def mark_notifications_as_read(self, notification_ids: List[int], user_id: int) -> int:
+        """
+        Mark several of a user's notifications as read in one UPDATE
+        Returns the number of notifications updated
+        """
+        result = self.db.execute(_MARK_READ, {
+            "notification_ids": notification_ids,
+            "owner_id": user_id,
+            "read_time": datetime.utcnow()
+        })
+        self.db.commit()
+        return result.rowcount
     
     def retry_failed_notifications(self, max_retries: int = 3) -> Dict[str, int]:
         """Retry failed notifications that haven't exceeded max retries"""
-        failed_notifications = (self.db.query(NotificationDelivery)
-                              .filter(and_(
-                                  NotificationDelivery.status == DeliveryStatus.FAILED,
-                                  NotificationDelivery.retry_count < max_retries,
-                                  or_(
-                                      NotificationDelivery.next_retry_at.is_(None),
-                                      NotificationDelivery.next_retry_at <= datetime.utcnow()
-                                  )
-                              ))
-                              .all())
+        now = datetime.utcnow()
+        due_for_retry = and_(
+            NotificationDelivery.status == DeliveryStatus.FAILED,
+            NotificationDelivery.retry_count < max_retries,
+            or_(
+                NotificationDelivery.next_retry_at.is_(None),
+                NotificationDelivery.next_retry_at <= now
+            )
+        )
+        
+        # An in-app retry always succeeds, so every due in-app delivery is
+        # retried and delivered by one UPDATE
+        in_app_retried = self.db.execute(
+            update(NotificationDelivery)
+            .where(and_(due_for_retry, NotificationDelivery.channel == DeliveryChannel.IN_APP))
+            .values(
+                status=DeliveryStatus.DELIVERED,
+                sent_at=now,
+                delivered_at=now,
+                retry_count=NotificationDelivery.retry_count + 1,
+                next_retry_at=None
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
         
         results = {
-            'retried': 0,
-            'succeeded': 0,
+            'retried': in_app_retried,
+            'succeeded': in_app_retried,
             'still_failed': 0
         }
         
+        failed_notifications = (self.db.query(NotificationDelivery)
+                              .options(
+                                  joinedload(NotificationDelivery.alert),
+                                  joinedload(NotificationDelivery.user)
+                              )
+                              .filter(due_for_retry)
+                              .yield_per(500))
+        
         for delivery in failed_notifications:
             delivery.retry_count += 1
-            delivery.next_retry_at = datetime.utcnow() + timedelta(minutes=5 * delivery.retry_count)
             
             if self._send_notification(delivery):
                 results['succeeded'] += 1
             else:
+                # Back off only once this attempt has actually failed
+                delivery.next_retry_at = now + timedelta(minutes=5 * delivery.retry_count)
                 results['still_failed'] += 1
             
             results['retried'] += 1
@@ -283,26 +430,15 @@ class NotificationService:
         return results
     
     def get_delivery_stats(self) -> Dict[str, int]:
-        """Get notification delivery statistics"""
-        total_sent = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status.in_([
-                DeliveryStatus.SENT, 
-                DeliveryStatus.DELIVERED, 
-                DeliveryStatus.READ
-            ])
-        ).count()
+        """Get notification delivery statistics from one grouped count"""
+        counts = dict(self.db.query(NotificationDelivery.status, func.count(NotificationDelivery.id))
+                      .group_by(NotificationDelivery.status)
+                      .all())
         
-        total_delivered = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status.in_([DeliveryStatus.DELIVERED, DeliveryStatus.READ])
-        ).count()
-        
-        total_read = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status == DeliveryStatus.READ
-        ).count()
-        
-        total_failed = self.db.query(NotificationDelivery).filter(
-            NotificationDelivery.status == DeliveryStatus.FAILED
-        ).count()
+        total_read = counts.get(DeliveryStatus.READ, 0)
+        total_delivered = counts.get(DeliveryStatus.DELIVERED, 0) + total_read
+        total_sent = counts.get(DeliveryStatus.SENT, 0) + total_delivered
+        total_failed = counts.get(DeliveryStatus.FAILED, 0)
         
         return {
             'total_sent': total_sent,
@@ -313,12 +449,19 @@ class NotificationService:
             'read_rate': (total_read / total_delivered * 100) if total_delivered > 0 else 0
         }
     
-    def _send_notification(self, delivery: NotificationDelivery) -> bool:
-        """Send a single notification using appropriate channel"""
+    def _send_notification(self, delivery: NotificationDelivery,
+                           alert: Optional[Alert] = None, user: Optional[User] = None) -> bool:
+        """
+        Send a single notification using appropriate channel
+        Callers that already hold the delivery's alert and user pass them in;
+        batch callers eager-load them onto the delivery instead
+        """
         try:
             # Get alert and user
-            alert = self.db.query(Alert).filter(Alert.id == delivery.alert_id).first()
-            user = self.db.query(User).filter(User.id == delivery.user_id).first()
+            if alert is None:
+                alert = delivery.alert
+            if user is None:
+                user = delivery.user
             
             if not alert or not user:
                 delivery.status = DeliveryStatus.FAILED
@@ -345,6 +488,43 @@ class NotificationService:
             delivery.error_message = str(e)
             return False
     
+    def _unread_reminder_ids(self, reminder_data: List[Dict]) -> Dict[Tuple[int, int], int]:
+        """Latest delivered, unread reminder delivery ID per (alert ID, user ID) among the due reminders"""
+        alert_ids = [data['alert'].id for data in reminder_data]
+        user_ids = {preference.user_id for data in reminder_data for preference in data['users']}
+        if not alert_ids or not user_ids:
+            return {}
+        
+        rows = (self.db.query(
+                    NotificationDelivery.alert_id,
+                    NotificationDelivery.user_id,
+                    func.max(NotificationDelivery.id)
+                )
+                .filter(and_(
+                    NotificationDelivery.alert_id.in_(alert_ids),
+                    NotificationDelivery.status == DeliveryStatus.DELIVERED,
+                    NotificationDelivery.is_reminder == True,
+                    NotificationDelivery.user_id.in_(user_ids),
+                    NotificationDelivery.read_at.is_(None)
+                ))
+                .group_by(NotificationDelivery.alert_id, NotificationDelivery.user_id)
+                .all())
+        return {(alert_id, user_id): delivery_id for alert_id, user_id, delivery_id in rows}
+    
+    def _new_delivery(self, alert: Alert, user: User, channel: DeliveryChannel,
+                      is_reminder: bool = False, reminder_sequence: int = None) -> NotificationDelivery:
+        """Build a pending delivery record, leaving adding and committing it to the caller"""
+        return NotificationDelivery(
+            alert_id=alert.id,
+            user_id=user.id,
+            channel=channel,
+            status=DeliveryStatus.PENDING,
+            scheduled_at=datetime.utcnow(),
+            is_reminder=is_reminder,
+            reminder_sequence=reminder_sequence,
+            delivery_address=self._get_delivery_address(user, channel)
+        )
+    
     def _get_delivery_address(self, user: User, channel: DeliveryChannel) -> Optional[str]:
         """Get delivery address for user based on channel"""
         if channel == DeliveryChannel.EMAIL:
@@ -1,12 +1,23 @@
 # app/services/team_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import Optional, List
-from app.models.team import Team
+from sqlalchemy import and_, bindparam, column, literal_column, select, table, update
+from typing import Optional, List, Dict
+from app.core.cache import user_cache, count_cache, members_cache
+from app.models.team import Team, TeamMemberCount
 from app.models.user import User
+from app.schemas import USER_LIST_ADAPTER
 from app.schemas.team import TeamCreate, TeamUpdate
 from .base_service import BaseService
 
+# Name lookup behind team creation and renames, built once per process
+_TEAM_BY_NAME = select(Team).where(Team.name == bindparam("name")).limit(1)
+
+# SQLite trigram index over team name and description (see app.models.team)
+_team_search = table("team_search", column("rowid"))
+
+# The trigram index needs at least three characters to match on
+_MIN_INDEXED_SEARCH_LENGTH = 3
+
 class TeamService(BaseService[Team, TeamCreate, TeamUpdate]):
     """
     Service class for Team operations
@@ -18,48 +29,16 @@ class TeamService(BaseService[Team, TeamCreate, TeamUpdate]):
     
     def get_by_name(self, name: str) -> Optional[Team]:
         """Find team by name"""
-        return self.db.query(Team).filter(Team.name == name).first()
+        return self.db.scalars(_TEAM_BY_NAME, {"name": name}).first()
     
     def get_active_teams(self, skip: int = 0, limit: int = 100) -> List[Team]:
-        """Get all active teams"""
+        """Get all active teams; member_count is loaded in the same SELECT"""
         return (self.db.query(Team)
                 .filter(Team.is_active == True)
                 .offset(skip)
                 .limit(limit)
                 .all())
     
-    def get_teams_with_member_count(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get teams with their member counts"""
-        result = (self.db.query(
-                    Team.id,
-                    Team.name,
-                    Team.description,
-                    Team.is_active,
-                    Team.created_at,
-                    Team.updated_at,
-                    func.count(User.id).label('member_count')
-                )
-                .outerjoin(User, and_(Team.id == User.team_id, User.is_active == True))
-                .filter(Team.is_active == True)
-                .group_by(Team.id)
-                .offset(skip)
-                .limit(limit)
-                .all())
-        
-        teams = []
-        for row in result:
-            teams.append({
-                'id': row.id,
-                'name': row.name,
-                'description': row.description,
-                'is_active': row.is_active,
-                'created_at': row.created_at,
-                'updated_at': row.updated_at,
-                'member_count': row.member_count
-            })
-        
-        return teams
-    
     def create_team(self, team_data: TeamCreate) -> Team:
         """Create a new team with validation"""
         # Check if team name already exists
@@ -67,7 +46,9 @@ class TeamService(BaseService[Team, TeamCreate, TeamUpdate]):
         if existing_team:
             raise ValueError(f"Team with name '{team_data.name}' already exists")
         
-        return self.create(team_data)
+        team = self.create(team_data)
+        count_cache.clear()
+        return team
     
     def update_team(self, team_id: int, team_data: TeamUpdate) -> Optional[Team]:
         """Update team with validation"""
@@ -83,15 +64,34 @@ class TeamService(BaseService[Team, TeamCreate, TeamUpdate]):
         
         return self.update(team_id, team_data)
     
-    def get_team_members(self, team_id: int) -> List[User]:
-        """Get all members of a specific team"""
-        return (self.db.query(User)
-                .filter(and_(User.team_id == team_id, User.is_active == True))
-                .all())
+    def get_team_members(self, team_id: int, after_id: Optional[int] = None,
+                         limit: Optional[int] = None) -> List[User]:
+        """Get active members of a specific team, ordered by ID"""
+        query = (self.db.query(User)
+                 .filter(and_(User.team_id == team_id, User.is_active == True)))
+        
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+        
+        query = query.order_by(User.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    def get_team_members_json(self, team_id: int) -> bytes:
+        """Get a team's active members as serialized UserResponse JSON, cached briefly"""
+        payload = members_cache.get(team_id)
+        if payload is None:
+            members = self.get_team_members(team_id)
+            payload = USER_LIST_ADAPTER.dump_json(
+                USER_LIST_ADAPTER.validate_python(members, from_attributes=True)
+            )
+            members_cache.set(team_id, payload)
+        return payload
     
     def add_member_to_team(self, user_id: int, team_id: int) -> bool:
         """Add a user to a team"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.get(User, user_id)
         team = self.get_by_id(team_id)
         
         if not user or not team:
@@ -99,45 +99,83 @@ class TeamService(BaseService[Team, TeamCreate, TeamUpdate]):
         
         user.team_id = team_id
         self.db.commit()
+        user_cache.invalidate(user_id)
+        members_cache.clear()
         return True
     
     def remove_member_from_team(self, user_id: int) -> bool:
         """Remove a user from their current team"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.get(User, user_id)
         if not user:
             return False
         
         user.team_id = None
         self.db.commit()
+        user_cache.invalidate(user_id)
+        members_cache.clear()
         return True
     
     def deactivate_team(self, team_id: int) -> bool:
         """Deactivate team and remove all members from it"""
-        team = self.get_by_id(team_id)
-        if not team:
+        # Deactivate the team; the rowcount doubles as the existence check,
+        # so the team row is never loaded
+        deactivated = self.db.execute(
+            update(Team)
+            .where(Team.id == team_id)
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not deactivated:
             return False
         
-        # Remove all members from the team
-        self.db.query(User).filter(User.team_id == team_id).update({User.team_id: None})
-        
-        # Deactivate the team
-        team.is_active = False
+        # Remove all members from the team, in the same transaction
+        self.db.execute(
+            update(User)
+            .where(User.team_id == team_id)
+            .values(team_id=None)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
+        user_cache.clear()
+        members_cache.clear()
+        count_cache.clear()
         return True
     
     def get_team_member_count(self, team_id: int) -> int:
         """Get the number of active members in a team"""
-        return (self.db.query(User)
-                .filter(and_(User.team_id == team_id, User.is_active == True))
-                .count())
+        count = (self.db.query(TeamMemberCount.member_count)
+                 .filter(TeamMemberCount.team_id == team_id)
+                 .scalar())
+        return count or 0
     
-    def search_teams(self, search_term: str, limit: int = 10) -> List[Team]:
-        """Search teams by name or description"""
+    def get_member_counts_batch(self, team_ids: List[int]) -> Dict[int, int]:
+        """Get active member counts for several teams in one lookup"""
+        if not team_ids:
+            return {}
+        
+        rows = (self.db.query(TeamMemberCount.team_id, TeamMemberCount.member_count)
+                .filter(TeamMemberCount.team_id.in_(team_ids))
+                .all())
+        return dict(rows)
+    
+    def search_teams(self, search_term: str, limit: int = 10, skip: int = 0) -> List[Team]:
+        """Search teams by name or description (case-insensitive substring match)"""
+        if (self.db.get_bind().dialect.name == "sqlite"
+                and len(search_term) >= _MIN_INDEXED_SEARCH_LENGTH):
+            # A quoted FTS5 phrase matches the term literally anywhere in
+            # either column, the same rows as the ILIKE below
+            phrase = '"' + search_term.replace('"', '""') + '"'
+            matches = Team.id.in_(
+                select(_team_search.c.rowid)
+                .where(literal_column("team_search").op("MATCH")(phrase))
+            )
+        else:
+            matches = (Team.name.ilike(f"%{search_term}%") |
+                       Team.description.ilike(f"%{search_term}%"))
+        
         return (self.db.query(Team)
-                .filter(and_(
-                    Team.is_active == True,
-                    Team.name.ilike(f"%{search_term}%") | 
-                    Team.description.ilike(f"%{search_term}%")
-                ))
+                .filter(and_(Team.is_active == True, matches))
+                .order_by(Team.id)
+                .offset(skip)
                 .limit(limit)
                 .all())
\ No newline at end of file
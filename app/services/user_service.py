@@ -1,12 +1,16 @@
 # app/services/user_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam, exists, select
 from typing import Optional, List
+from app.core.cache import user_cache, count_cache, members_cache
 from app.models.user import User
 from app.models.team import Team
 from app.schemas.user import UserCreate, UserUpdate
 from .base_service import BaseService
 
+# Login lookup, built once so each call only binds the email
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
+
 class UserService(BaseService[User, UserCreate, UserUpdate]):
     """
     Service class for User operations
@@ -18,7 +22,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
     
     def get_by_email(self, email: str) -> Optional[User]:
         """Find user by email address"""
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.scalars(_USER_BY_EMAIL, {"email": email}).first()
     
     def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all active users"""
@@ -42,18 +46,12 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
     
     def create_user(self, user_data: UserCreate) -> User:
         """Create a new user with validation"""
-        # Check if email already exists
-        existing_user = self.get_by_email(user_data.email)
-        if existing_user:
-            raise ValueError(f"User with email {user_data.email} already exists")
-        
-        # Validate team exists if team_id provided
-        if user_data.team_id:
-            team = self.db.query(Team).filter(Team.id == user_data.team_id).first()
-            if not team:
-                raise ValueError(f"Team with id {user_data.team_id} does not exist")
+        self._validate_email_and_team(user_data.email, user_data.team_id)
         
-        return self.create(user_data)
+        user = self.create(user_data)
+        count_cache.clear()
+        members_cache.clear()
+        return user
     
     def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
         """Update user with validation"""
@@ -61,19 +59,33 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         if not user:
             return None
         
-        # Check email uniqueness if email is being changed
-        if user_data.email and user_data.email != user.email:
-            existing_user = self.get_by_email(user_data.email)
-            if existing_user:
-                raise ValueError(f"User with email {user_data.email} already exists")
+        # Email uniqueness only matters if the email is being changed
+        new_email = user_data.email if user_data.email != user.email else None
+        self._validate_email_and_team(new_email, user_data.team_id)
         
-        # Validate team exists if team_id is being changed
-        if user_data.team_id:
-            team = self.db.query(Team).filter(Team.id == user_data.team_id).first()
-            if not team:
-                raise ValueError(f"Team with id {user_data.team_id} does not exist")
+        updated_user = self.update(user_id, user_data)
+        user_cache.invalidate(user_id)
+        members_cache.clear()
+        return updated_user
+    
+    def _validate_email_and_team(self, email: Optional[str], team_id: Optional[int]) -> None:
+        """
+        Raise ValueError if the email is taken or the team does not exist
+        Both checks run as EXISTS subqueries of a single SELECT
+        """
+        checks = []
+        if email:
+            checks.append(exists().where(User.email == email).label('email_taken'))
+        if team_id:
+            checks.append(exists().where(Team.id == team_id).label('team_exists'))
+        if not checks:
+            return
         
-        return self.update(user_id, user_data)
+        found = self.db.execute(select(*checks)).one()._mapping
+        if found.get('email_taken'):
+            raise ValueError(f"User with email {email} already exists")
+        if team_id and not found['team_exists']:
+            raise ValueError(f"Team with id {team_id} does not exist")
     
     def authenticate_user(self, email: str) -> Optional[User]:
         """Simple authentication by email (MVP - no passwords)"""
@@ -88,21 +100,16 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         if user:
             user.is_active = False
             self.db.commit()
+            user_cache.invalidate(user_id)
+            members_cache.clear()
+            count_cache.clear()
             return True
         return False
     
     def get_users_count_by_team(self) -> dict:
-        """Get count of users per team"""
-        result = (self.db.query(Team.id, Team.name, User.id)
-                 .outerjoin(User, Team.id == User.team_id)
-                 .filter(User.is_active == True)
-                 .all())
-        
-        team_counts = {}
-        for team_id, team_name, user_id in result:
-            if team_name not in team_counts:
-                team_counts[team_name] = 0
-            if user_id:
-                team_counts[team_name] += 1
-                
-        return team_counts
\ No newline at end of file
+        """Get count of active users per active team, including empty teams"""
+        # Read from the trigger-maintained team_member_counts, one primary
+        # key probe per team instead of a row per user
+        return dict(self.db.query(Team.name, Team.member_count)
+                    .filter(Team.is_active == True)
+                    .all())
\ No newline at end of file
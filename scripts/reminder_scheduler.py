@@ -5,35 +5,81 @@ In production, this would be replaced by a proper task queue like Celery
 import asyncio
 import time
 from datetime import datetime
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import session_scope
+from app.services.alert_service import AlertService
+from app.services.analytics_service import AnalyticsService
 from app.services.notification_service import NotificationService
 
+def process_reminders_once():
+    """Expire alerts past their expiry time, then send due reminders"""
+    print(f"[{datetime.now()}] Processing reminders...")
+    
+    with session_scope() as db:
+        # Expire alerts past their expiry time before sending reminders
+        expired = AlertService(db).expire_alerts()
+        if expired:
+            print(f"⌛ Expired {expired} alerts")
+        
+        # Process reminders
+        results = NotificationService(db).process_reminders()
+    
+    if results['reminders_sent'] > 0:
+        print(f"✅ Sent {results['reminders_sent']} reminders to {results['users_reminded']} users")
+    else:
+        print("📭 No reminders to send")
+
+def send_pending_once():
+    """Send deliveries that were scheduled but not sent by the request that created them"""
+    with session_scope() as db:
+        results = NotificationService(db).send_pending_notifications()
+    if results['total'] > 0:
+        print(f"[{datetime.now()}] 📨 Sent {results['sent']} of {results['total']} pending notifications")
+
+def refresh_analytics_once():
+    """Recompute the analytics dashboard snapshot"""
+    with session_scope() as db:
+        AnalyticsService(db).refresh_snapshot()
+    print(f"[{datetime.now()}] 📊 Refreshed analytics snapshot")
+
+# The jobs' database work is synchronous, so each run goes to a worker
+# thread; otherwise one job would block the event loop and delay the other
+
 async def process_reminders_job():
     """Background job to process reminder notifications"""
     while True:
         try:
-            print(f"[{datetime.now()}] Processing reminders...")
-            
-            db = SessionLocal()
-            notification_service = NotificationService(db)
-            
-            # Process reminders
-            results = notification_service.process_reminders()
-            
-            if results['reminders_sent'] > 0:
-                print(f"✅ Sent {results['reminders_sent']} reminders to {results['users_reminded']} users")
-            else:
-                print("📭 No reminders to send")
-            
-            db.close()
-            
+            await asyncio.to_thread(process_reminders_once)
         except Exception as e:
             print(f"❌ Error processing reminders: {e}")
         
-        # Wait 30 minutes before next check (configurable)
-        await asyncio.sleep(1800)  # 1800 seconds = 30 minutes
+        await asyncio.sleep(settings.reminder_check_interval_seconds)
+
+async def send_pending_job():
+    """Background job draining pending deliveries off the request path"""
+    while True:
+        try:
+            await asyncio.to_thread(send_pending_once)
+        except Exception as e:
+            print(f"❌ Error sending pending notifications: {e}")
+        
+        await asyncio.sleep(settings.pending_delivery_interval_seconds)
+
+async def refresh_analytics_job():
+    """Background job to keep the analytics dashboard snapshot fresh"""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_analytics_once)
+        except Exception as e:
+            print(f"❌ Error refreshing analytics snapshot: {e}")
+        
+        # Refresh a little before the dashboard would treat the snapshot as stale
+        await asyncio.sleep(max(settings.analytics_snapshot_max_age_seconds - 30, 30))
+
+async def main():
+    await asyncio.gather(process_reminders_job(), send_pending_job(), refresh_analytics_job())
 
 if __name__ == "__main__":
     print("🚀 Starting reminder scheduler...")
-    print("⏰ Checking for reminders every 30 minutes")
-    asyncio.run(process_reminders_job())
+    print(f"⏰ Checking for reminders every {settings.reminder_check_interval_seconds} seconds")
+    asyncio.run(main())
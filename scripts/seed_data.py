@@ -1,236 +1,388 @@
 """
 Seed script to populate the database with sample data for testing
 """
+import csv
+import io
+import sys
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from ..app.core.database import SessionLocal, create_tables
+from ..app.core.database import session_scope, create_tables
 from ..app.models.user import User
 from ..app.models.team import Team
-from ..app.models.alert import Alert, SeverityLevel, DeliveryType, VisibilityType, AlertStatus
+from ..app.models.alert import (
+    Alert, SeverityLevel, DeliveryType, VisibilityType, AlertStatus,
+    alert_target_teams, alert_target_users
+)
 from ..app.models.user_alert_preference import UserAlertPreference
+from collections import defaultdict
+from itertools import islice
 from datetime import datetime, timedelta
-import json
+from typing import Iterator, List
 
-def seed_database():
-    """Seed the database with sample data"""
-    create_tables()
-    db = SessionLocal()
+# Rows per executemany when streaming generated seed rows
+SEED_INSERT_CHUNK_SIZE = 1000
+
+def _insert_returning_ids(db: Session, model, rows: List[dict], key: str) -> List[int]:
+    """
+    Insert rows with one multi-row INSERT and return their new IDs in row order
+    RETURNING order isn't guaranteed (SQLAlchemy would fall back to one INSERT
+    per row to promise it), so IDs are matched back through `key`, a column
+    unique among the rows
+    """
+    if not rows:
+        return []
+    ids = dict(db.execute(insert(model).returning(getattr(model, key), model.id), rows).all())
+    return [ids[row[key]] for row in rows]
+
+def _insert_missing(db: Session, model, rows: List[dict], key: str) -> None:
+    """
+    Insert rows in one executemany, skipping any whose unique `key` already
+    exists, so seeding twice doesn't fail on the unique constraint
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    db.execute(
+        dialect.insert(model.__table__).on_conflict_do_nothing(index_elements=[key]),
+        rows
+    )
+
+def _preference_row(user_id: int, alert_id: int, **fields) -> dict:
+    """
+    A user alert preference row for the bulk INSERT. Every row carries the
+    same keys, so each chunk goes out as a single executemany
+    """
+    row = {
+        "user_id": user_id,
+        "alert_id": alert_id,
+        "is_read": False,
+        "read_at": None,
+        "is_snoozed": False,
+        "snoozed_at": None,
+        "snoozed_until": None,
+        "snooze_count": 0,
+        "reminder_count": 0,
+        "last_reminded_at": None
+    }
+    row.update(fields)
+    return row
+
+def _copy_rows(db: Session, table, rows: Iterator[dict]) -> int:
+    """
+    Stream rows into a table with PostgreSQL COPY FROM STDIN (psycopg2) and
+    return how many were written. It runs on the session's own connection,
+    so the rows commit with the rest of the seed
+    """
+    first = next(rows, None)
+    if first is None:
+        return 0
+    # Only the columns the rows carry, so server defaults still apply
+    columns = list(first)
+    buffer = io.StringIO()
+    # None becomes an unquoted empty field, which COPY's CSV format reads as NULL
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writerow(first)
+    writer.writerows(rows)
+    buffer.seek(0)
     
+    cursor = db.connection().connection.cursor()
     try:
-        print("🌱 Seeding database with sample data...")
-        
-        # Create Teams
-        teams_data = [
-            {"name": "Engineering", "description": "Software development team"},
-            {"name": "Marketing", "description": "Marketing and growth team"},
-            {"name": "Operations", "description": "Operations and infrastructure team"},
-            {"name": "Design", "description": "Product design team"}
-        ]
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH CSV",
+            buffer
+        )
+    finally:
+        cursor.close()
+    return buffer.getvalue().count("\n")
+
+def _iter_preference_rows(alerts: List[dict], users: List[dict], now: datetime) -> Iterator[dict]:
+    """Yield the seeded user alert preference rows (simulated interactions)"""
+    # Interaction times shared by every preference row
+    one_hour_ago = now - timedelta(hours=1)
+    two_hours_ago = now - timedelta(hours=2)
+    three_hours_ago = now - timedelta(hours=3)
+    four_hours_ago = now - timedelta(hours=4)
+    snooze_ends_at = now + timedelta(hours=10)
+    
+    # A user's simulated interactions depend only on the user, so they are
+    # worked out once per user rather than for every (alert, user) pair
+    org_interactions = {}
+    team_interactions = {}
+    for user in users:
+        is_read = user["id"] % 3 == 0  # Some users have read it
+        is_snoozed = user["id"] % 5 == 0  # Some users have snoozed it
+        org_interactions[user["id"]] = dict(
+            is_read=is_read,
+            read_at=two_hours_ago if is_read else None,
+            is_snoozed=is_snoozed,
+            snoozed_at=one_hour_ago if is_snoozed else None,
+            snoozed_until=snooze_ends_at if is_snoozed else None,
+            snooze_count=1 if is_snoozed else 0
+        )
         
-        teams = []
-        for team_data in teams_data:
-            existing = db.query(Team).filter(Team.name == team_data["name"]).first()
-            if not existing:
-                team = Team(**team_data)
-                db.add(team)
-                teams.append(team)
-            else:
-                teams.append(existing)
+        is_read = user["id"] % 4 == 0
+        reminder_count = 1 if user["id"] % 3 == 0 else 0
+        team_interactions[user["id"]] = dict(
+            is_read=is_read,
+            read_at=one_hour_ago if is_read else None,
+            reminder_count=reminder_count,
+            last_reminded_at=three_hours_ago if reminder_count > 0 else None
+        )
+    
+    # Organization-wide alerts - create preferences for all users
+    org_alerts = [a for a in alerts if a["visibility_type"] == VisibilityType.ORGANIZATION]
+    for alert in org_alerts:
+        for user in users:
+            yield _preference_row(user["id"], alert["id"], **org_interactions[user["id"]])
+    
+    # Team-specific alerts, with users indexed by team once rather than
+    # scanning every user for each alert
+    users_by_team = defaultdict(list)
+    for user in users:
+        users_by_team[user["team_id"]].append(user)
+    
+    team_alerts = [a for a in alerts if a["visibility_type"] == VisibilityType.TEAM]
+    for alert in team_alerts:
+        target_team_ids = alert["target_team_ids"]
+        team_users = [u for team_id in target_team_ids for u in users_by_team[team_id]]
         
-        db.commit()
-        print(f"✅ Created {len(teams)} teams")
+        for user in team_users:
+            yield _preference_row(user["id"], alert["id"], **team_interactions[user["id"]])
+    
+    # User-specific alerts
+    user_alerts = [a for a in alerts if a["visibility_type"] == VisibilityType.USER]
+    for alert in user_alerts:
+        target_user_ids = alert["target_user_ids"]
         
-        # Create Users
-        users_data = [
-            # Admins
-            {"name": "Alice Admin", "email": "alice@company.com", "is_admin": True, "team_id": teams[0].id},
-            {"name": "Bob Manager", "email": "bob@company.com", "is_admin": True, "team_id": teams[1].id},
+        for user_id in target_user_ids:
+            # User-specific alerts usually unread
+            yield _preference_row(
+                user_id, alert["id"],
+                reminder_count=2,
+                last_reminded_at=four_hours_ago
+            )
+
+def _print_summary(team_count: int, user_count: int, alert_count: int, preference_count: int):
+    """Print what was seeded and how to try the API"""
+    print("\n🎉 Database seeded successfully!")
+    print("\n📊 Sample Data Summary:")
+    print(f"   Teams: {team_count}")
+    print(f"   Users: {user_count} (2 admins, {user_count - 2} regular users)")
+    print(f"   Alerts: {alert_count}")
+    print(f"   User Preferences: {preference_count}")
+    
+    print("\n🔑 Sample Admin Users:")
+    print("   Alice Admin (alice@company.com) - User ID: 1")
+    print("   Bob Manager (bob@company.com) - User ID: 2")
+    
+    print("\n📝 API Usage Examples:")
+    print("   # Login as admin:")
+    print("   curl -X POST http://localhost:8000/api/v1/users/login \\")
+    print("        -H 'Content-Type: application/json' \\")
+    print("        -d '{\"email\": \"alice@company.com\"}'")
+    print()
+    print("   # Get alerts for user (add X-User-ID header):")
+    print("   curl -X GET http://localhost:8000/api/v1/alerts/me \\")
+    print("        -H 'X-User-ID: 1'")
+    print()
+    print("   # View analytics dashboard:")
+    print("   curl -X GET http://localhost:8000/api/v1/analytics/dashboard \\")
+    print("        -H 'X-User-ID: 1'")
+
+def seed_database(force: bool = False):
+    """
+    Seed the database with sample data
+    A database that already has alerts is left alone unless force is set,
+    since the sample alerts would otherwise be added again
+    """
+    create_tables()
+    
+    # session_scope rolls back and returns the connection to the pool before
+    # an error is reported
+    try:
+        with session_scope() as db:
+            if not force and db.scalar(select(Alert.id).limit(1)) is not None:
+                print("⏭️  Database already seeded, skipping (pass --force to seed again)")
+                return
             
-            # Regular Users
-            {"name": "Charlie Developer", "email": "charlie@company.com", "is_admin": False, "team_id": teams[0].id},
-            {"name": "Diana Designer", "email": "diana@company.com", "is_admin": False, "team_id": teams[3].id},
-            {"name": "Eve Engineer", "email": "eve@company.com", "is_admin": False, "team_id": teams[0].id},
-            {"name": "Frank Marketer", "email": "frank@company.com", "is_admin": False, "team_id": teams[1].id},
-            {"name": "Grace Ops", "email": "grace@company.com", "is_admin": False, "team_id": teams[2].id},
-            {"name": "Henry Developer", "email": "henry@company.com", "is_admin": False, "team_id": teams[0].id}
-        ]
-        
-        users = []
-        for user_data in users_data:
-            existing = db.query(User).filter(User.email == user_data["email"]).first()
-            if not existing:
-                user = User(**user_data)
-                db.add(user)
-                users.append(user)
-            else:
-                users.append(existing)
-        
-        db.commit()
-        print(f"✅ Created {len(users)} users")
-        
-        # Create Sample Alerts
-        alerts_data = [
-            {
-                "title": "System Maintenance Window",
-                "message": "Scheduled maintenance will occur this weekend. Please save your work.",
-                "severity": SeverityLevel.WARNING,
-                "delivery_type": DeliveryType.IN_APP,
-                "visibility_type": VisibilityType.ORGANIZATION,
-                "created_by": users[0].id,  # Alice Admin
-                "start_time": datetime.utcnow(),
-                "expiry_time": datetime.utcnow() + timedelta(days=7),
-                "reminder_interval_hours": 2
-            },
-            {
-                "title": "Security Update Required",
-                "message": "Please update your passwords and enable 2FA by end of week.",
-                "severity": SeverityLevel.CRITICAL,
-                "delivery_type": DeliveryType.IN_APP,
-                "visibility_type": VisibilityType.ORGANIZATION,
-                "created_by": users[0].id,
-                "start_time": datetime.utcnow(),
-                "expiry_time": datetime.utcnow() + timedelta(days=14),
-                "reminder_interval_hours": 4
-            },
-            {
-                "title": "Engineering Team Meeting",
-                "message": "Sprint planning meeting tomorrow at 10 AM in conference room A.",
-                "severity": SeverityLevel.INFO,
-                "delivery_type": DeliveryType.IN_APP,
-                "visibility_type": VisibilityType.TEAM,
-                "target_team_ids": json.dumps([teams[0].id]),  # Engineering team
-                "created_by": users[0].id,
-                "start_time": datetime.utcnow(),
-                "expiry_time": datetime.utcnow() + timedelta(days=1)
-            },
-            {
-                "title": "Marketing Campaign Launch",
-                "message": "New product launch campaign goes live next Monday. All hands on deck!",
-                "severity": SeverityLevel.WARNING,
-                "delivery_type": DeliveryType.IN_APP,
-                "visibility_type": VisibilityType.TEAM,
-                "target_team_ids": json.dumps([teams[1].id]),  # Marketing team
-                "created_by": users[1].id,  # Bob Manager
-                "start_time": datetime.utcnow(),
-                "expiry_time": datetime.utcnow() + timedelta(days=3)
-            },
-            {
-                "title": "Personal Task Reminder",
-                "message": "Don't forget to submit your quarterly review by Friday.",
-                "severity": SeverityLevel.INFO,
-                "delivery_type": DeliveryType.IN_APP,
-                "visibility_type": VisibilityType.USER,
-                "target_user_ids": json.dumps([users[2].id]),  # Charlie Developer
-                "created_by": users[0].id,
-                "start_time": datetime.utcnow(),
-                "expiry_time": datetime.utcnow() + timedelta(days=5)
-            }
-        ]
-        
-        alerts = []
-        for alert_data in alerts_data:
-            alert = Alert(**alert_data)
-            db.add(alert)
-            alerts.append(alert)
-        
-        db.commit()
-        print(f"✅ Created {len(alerts)} alerts")
-        
-        # Create User Alert Preferences (simulate some interactions)
-        preferences_data = []
-        
-        # Organization-wide alerts - create preferences for all users
-        org_alerts = [a for a in alerts if a.visibility_type == VisibilityType.ORGANIZATION]
-        for alert in org_alerts:
-            for user in users:
-                pref = UserAlertPreference(
-                    user_id=user.id,
-                    alert_id=alert.id,
-                    is_read=user.id % 3 == 0,  # Some users have read it
-                    is_snoozed=user.id % 5 == 0,  # Some users have snoozed it
-                    snooze_count=1 if user.id % 5 == 0 else 0
-                )
-                if pref.is_read:
-                    pref.read_at = datetime.utcnow() - timedelta(hours=2)
-                if pref.is_snoozed:
-                    pref.snoozed_at = datetime.utcnow() - timedelta(hours=1)
-                    pref.snoozed_until = datetime.utcnow() + timedelta(hours=10)
-                
-                preferences_data.append(pref)
-        
-        # Team-specific alerts
-        team_alerts = [a for a in alerts if a.visibility_type == VisibilityType.TEAM]
-        for alert in team_alerts:
-            target_team_ids = json.loads(alert.target_team_ids) if alert.target_team_ids else []
-            team_users = [u for u in users if u.team_id in target_team_ids]
+            print("🌱 Seeding database with sample data...")
             
-            for user in team_users:
-                pref = UserAlertPreference(
-                    user_id=user.id,
-                    alert_id=alert.id,
-                    is_read=user.id % 4 == 0,
-                    is_snoozed=False,
-                    reminder_count=1 if user.id % 3 == 0 else 0
-                )
-                if pref.is_read:
-                    pref.read_at = datetime.utcnow() - timedelta(hours=1)
-                if pref.reminder_count > 0:
-                    pref.last_reminded_at = datetime.utcnow() - timedelta(hours=3)
+            # Sample data doesn't need a durable commit, so PostgreSQL may skip
+            # waiting for the WAL flush; SET LOCAL lasts only for this transaction.
+            # SQLite connections already run WAL with synchronous=NORMAL, which
+            # doesn't fsync on commit.
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(text("SET LOCAL synchronous_commit = OFF"))
+            
+            # Every seeded timestamp is relative to one clock reading
+            now = datetime.utcnow()
+            
+            # Create Teams
+            teams_data = [
+                {"name": "Engineering", "description": "Software development team"},
+                {"name": "Marketing", "description": "Marketing and growth team"},
+                {"name": "Operations", "description": "Operations and infrastructure team"},
+                {"name": "Design", "description": "Product design team"}
+            ]
+            
+            # Teams that already exist are skipped by ON CONFLICT DO NOTHING; one
+            # SELECT then fetches every team's ID for wiring users and alerts
+            teams = teams_data
+            _insert_missing(db, Team, teams_data, "name")
+            team_ids = dict(
+                db.query(Team.name, Team.id)
+                .filter(Team.name.in_([t["name"] for t in teams_data]))
+                .all()
+            )
+            for team_data in teams_data:
+                team_data["id"] = team_ids[team_data["name"]]
+            
+            print(f"✅ Created {len(teams)} teams")
+            
+            # Create Users
+            users_data = [
+                # Admins
+                {"name": "Alice Admin", "email": "alice@company.com", "is_admin": True, "team_id": teams[0]["id"]},
+                {"name": "Bob Manager", "email": "bob@company.com", "is_admin": True, "team_id": teams[1]["id"]},
                 
-                preferences_data.append(pref)
-        
-        # User-specific alerts
-        user_alerts = [a for a in alerts if a.visibility_type == VisibilityType.USER]
-        for alert in user_alerts:
-            target_user_ids = json.loads(alert.target_user_ids) if alert.target_user_ids else []
+                # Regular Users
+                {"name": "Charlie Developer", "email": "charlie@company.com", "is_admin": False, "team_id": teams[0]["id"]},
+                {"name": "Diana Designer", "email": "diana@company.com", "is_admin": False, "team_id": teams[3]["id"]},
+                {"name": "Eve Engineer", "email": "eve@company.com", "is_admin": False, "team_id": teams[0]["id"]},
+                {"name": "Frank Marketer", "email": "frank@company.com", "is_admin": False, "team_id": teams[1]["id"]},
+                {"name": "Grace Ops", "email": "grace@company.com", "is_admin": False, "team_id": teams[2]["id"]},
+                {"name": "Henry Developer", "email": "henry@company.com", "is_admin": False, "team_id": teams[0]["id"]}
+            ]
             
-            for user_id in target_user_ids:
-                pref = UserAlertPreference(
-                    user_id=user_id,
-                    alert_id=alert.id,
-                    is_read=False,  # User-specific alerts usually unread
-                    is_snoozed=False,
-                    reminder_count=2
+            # Existing users are left untouched and keep their stored team
+            users = users_data
+            _insert_missing(db, User, users_data, "email")
+            user_ids = {
+                email: (user_id, team_id)
+                for email, user_id, team_id in (
+                    db.query(User.email, User.id, User.team_id)
+                    .filter(User.email.in_([u["email"] for u in users_data]))
+                    .all()
                 )
-                pref.last_reminded_at = datetime.utcnow() - timedelta(hours=4)
-                preferences_data.append(pref)
-        
-        for pref in preferences_data:
-            db.add(pref)
-        
-        db.commit()
-        print(f"✅ Created {len(preferences_data)} user alert preferences")
-        
-        print("\n🎉 Database seeded successfully!")
-        print("\n📊 Sample Data Summary:")
-        print(f"   Teams: {len(teams)}")
-        print(f"   Users: {len(users)} (2 admins, {len(users)-2} regular users)")
-        print(f"   Alerts: {len(alerts)}")
-        print(f"   User Preferences: {len(preferences_data)}")
-        
-        print("\n🔑 Sample Admin Users:")
-        print("   Alice Admin (alice@company.com) - User ID: 1")
-        print("   Bob Manager (bob@company.com) - User ID: 2")
-        
-        print("\n📝 API Usage Examples:")
-        print("   # Login as admin:")
-        print("   curl -X POST http://localhost:8000/api/v1/users/login \\")
-        print("        -H 'Content-Type: application/json' \\")
-        print("        -d '{\"email\": \"alice@company.com\"}'")
-        print()
-        print("   # Get alerts for user (add X-User-ID header):")
-        print("   curl -X GET http://localhost:8000/api/v1/alerts/me \\")
-        print("        -H 'X-User-ID: 1'")
-        print()
-        print("   # View analytics dashboard:")
-        print("   curl -X GET http://localhost:8000/api/v1/analytics/dashboard \\")
-        print("        -H 'X-User-ID: 1'")
-        
+            }
+            for user_data in users_data:
+                user_data["id"], user_data["team_id"] = user_ids[user_data["email"]]
+            
+            print(f"✅ Created {len(users)} users")
+            
+            # Create Sample Alerts
+            alerts_data = [
+                {
+                    "title": "System Maintenance Window",
+                    "message": "Scheduled maintenance will occur this weekend. Please save your work.",
+                    "severity": SeverityLevel.WARNING,
+                    "delivery_type": DeliveryType.IN_APP,
+                    "visibility_type": VisibilityType.ORGANIZATION,
+                    "created_by": users[0]["id"],  # Alice Admin
+                    "start_time": now,
+                    "expiry_time": now + timedelta(days=7),
+                    "reminder_interval_hours": 2
+                },
+                {
+                    "title": "Security Update Required",
+                    "message": "Please update your passwords and enable 2FA by end of week.",
+                    "severity": SeverityLevel.CRITICAL,
+                    "delivery_type": DeliveryType.IN_APP,
+                    "visibility_type": VisibilityType.ORGANIZATION,
+                    "created_by": users[0]["id"],
+                    "start_time": now,
+                    "expiry_time": now + timedelta(days=14),
+                    "reminder_interval_hours": 4
+                },
+                {
+                    "title": "Engineering Team Meeting",
+                    "message": "Sprint planning meeting tomorrow at 10 AM in conference room A.",
+                    "severity": SeverityLevel.INFO,
+                    "delivery_type": DeliveryType.IN_APP,
+                    "visibility_type": VisibilityType.TEAM,
+                    "target_team_ids": [teams[0]["id"]],  # Engineering team
+                    "created_by": users[0]["id"],
+                    "start_time": now,
+                    "expiry_time": now + timedelta(days=1),
+                    "reminder_interval_hours": 2
+                },
+                {
+                    "title": "Marketing Campaign Launch",
+                    "message": "New product launch campaign goes live next Monday. All hands on deck!",
+                    "severity": SeverityLevel.WARNING,
+                    "delivery_type": DeliveryType.IN_APP,
+                    "visibility_type": VisibilityType.TEAM,
+                    "target_team_ids": [teams[1]["id"]],  # Marketing team
+                    "created_by": users[1]["id"],  # Bob Manager
+                    "start_time": now,
+                    "expiry_time": now + timedelta(days=3),
+                    "reminder_interval_hours": 2
+                },
+                {
+                    "title": "Personal Task Reminder",
+                    "message": "Don't forget to submit your quarterly review by Friday.",
+                    "severity": SeverityLevel.INFO,
+                    "delivery_type": DeliveryType.IN_APP,
+                    "visibility_type": VisibilityType.USER,
+                    "target_user_ids": [users[2]["id"]],  # Charlie Developer
+                    "created_by": users[0]["id"],
+                    "start_time": now,
+                    "expiry_time": now + timedelta(days=5),
+                    "reminder_interval_hours": 2
+                }
+            ]
+            
+            # Target lists live in the association tables, so they are split off
+            # the alert rows and written with one INSERT per table. Every alert
+            # row sets the same columns so the alerts go out as one INSERT.
+            alerts = alerts_data
+            alert_rows = [
+                {key: value for key, value in alert_data.items()
+                 if key not in ("target_team_ids", "target_user_ids")}
+                for alert_data in alerts_data
+            ]
+            for alert_data, alert_id in zip(alerts_data, _insert_returning_ids(db, Alert, alert_rows, "title")):
+                alert_data["id"] = alert_id
+            
+            target_team_rows = [
+                {"alert_id": alert["id"], "team_id": team_id}
+                for alert in alerts for team_id in alert.get("target_team_ids", [])
+            ]
+            target_user_rows = [
+                {"alert_id": alert["id"], "user_id": user_id}
+                for alert in alerts for user_id in alert.get("target_user_ids", [])
+            ]
+            if target_team_rows:
+                db.execute(insert(alert_target_teams), target_team_rows)
+            if target_user_rows:
+                db.execute(insert(alert_target_users), target_user_rows)
+            
+            print(f"✅ Created {len(alerts)} alerts")
+            
+            # Create User Alert Preferences (simulate some interactions)
+            preference_rows = _iter_preference_rows(alerts, users, now)
+            preference_count = 0
+            if db.get_bind().dialect.driver == "psycopg2":
+                # COPY streams every row in one round trip
+                preference_count = _copy_rows(db, UserAlertPreference.__table__, preference_rows)
+            else:
+                # Rows are generated lazily and written in bulk INSERT chunks, so
+                # the full set never sits in memory at once
+                while chunk := list(islice(preference_rows, SEED_INSERT_CHUNK_SIZE)):
+                    # A Core INSERT on the table, since the ORM one would split the
+                    # chunk into separate batches wherever a row's NULL columns differ
+                    db.execute(insert(UserAlertPreference.__table__), chunk)
+                    preference_count += len(chunk)
+            
+            # The bulk INSERTs return their IDs, so nothing needs flushing along
+            # the way and the whole seed commits as one transaction
+            db.commit()
+            print(f"✅ Created {preference_count} user alert preferences")
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
-        db.rollback()
         raise
-    finally:
-        db.close()
+    
+    # Printed once the session has given its connection back
+    _print_summary(len(teams), len(users), len(alerts), preference_count)
 
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    seed_database(force="--force" in sys.argv[1:])
\ No newline at end of file